@@ -3,9 +3,8 @@ Channel management endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from typing import Optional
-from datetime import datetime
 
-from app.core.database import Database
+from app.core.database import Database, utc_timestamp
 from app.core.security import SessionBearer, SecurityManager
 from app.models.channel import (
     ChannelUpdate, ChannelResponse,
@@ -174,8 +173,11 @@ async def get_channel_videos(
         )
     
     # Use videos endpoint logic but filter by channel
-    from app.api.endpoints.videos import list_videos
-    return await list_videos(request, page, per_page, channel_id, status, None, db, _)
+    from app.api.endpoints.videos import list_videos, get_list_cache
+    return await list_videos(
+        request, page, per_page, channel_id, status, None,
+        db, get_list_cache(request), _
+    )
 
 
 @router.put("/{channel_id}", response_model=ChannelResponse)
@@ -203,7 +205,7 @@ async def update_channel(
     # Update channel
     update_data = channel_update.dict(exclude_unset=True)
     if update_data:
-        update_data['updated_at'] = datetime.utcnow().isoformat()
+        update_data['updated_at'] = utc_timestamp()
         
         if 'extra_metadata' in update_data:
             update_data['extra_metadata'] = Database.json_encode(update_data['extra_metadata'])
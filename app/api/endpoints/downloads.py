@@ -2,9 +2,12 @@
 Download queue management endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from pydantic import BaseModel
+import asyncio
+import orjson
 
 from app.core.database import Database
 from app.core.downloader import Downloader, DownloadProgress
@@ -13,6 +16,9 @@ from app.core.security import SessionBearer, SecurityManager
 
 router = APIRouter()
 
+# Seconds between keep-alive comments on an idle progress stream
+PROGRESS_STREAM_KEEPALIVE = 15.0
+
 
 class DownloadQueueItem(BaseModel):
     """Download queue item response"""
@@ -40,6 +46,21 @@ class DownloadQueueResponse(BaseModel):
     failed_count: int
 
 
+class ActiveDownloadProgress(BaseModel):
+    """Live progress of one running download"""
+    status: str
+    progress: float
+    speed: Optional[float] = None
+    eta: Optional[int] = None
+
+
+class ActiveProgressResponse(BaseModel):
+    """Live progress of running downloads, keyed by video id"""
+    version: int
+    changed: bool
+    downloads: Dict[int, ActiveDownloadProgress] = {}
+
+
 def get_db(request: Request) -> Database:
     """Get database from app state"""
     return request.app.state.db
@@ -130,6 +151,74 @@ async def list_downloads(
     )
 
 
+@router.get("/progress", response_model=ActiveProgressResponse)
+async def get_download_progress(
+    since: Optional[int] = Query(None, description="Version from the previous response"),
+    downloader: Downloader = Depends(get_downloader),
+    _: dict = Depends(get_auth)
+):
+    """
+    Get live progress of running downloads; pollers pass back the last version
+    and get changed=false with no downloads when nothing has moved since
+    """
+    version, active_downloads = downloader.get_active_downloads_since(since)
+    if active_downloads is None:
+        return ActiveProgressResponse(version=version, changed=False)
+    
+    return ActiveProgressResponse(
+        version=version,
+        changed=True,
+        downloads={
+            video_id: ActiveDownloadProgress(
+                status=active.status,
+                progress=active.progress,
+                speed=active.speed,
+                eta=active.eta
+            )
+            for video_id, active in active_downloads.items()
+        }
+    )
+
+
+@router.get("/progress/stream")
+async def stream_download_progress(
+    request: Request,
+    downloader: Downloader = Depends(get_downloader),
+    _: dict = Depends(get_auth)
+):
+    """
+    Stream live download progress as server-sent events
+    """
+    queue = downloader.subscribe()
+    
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    video_id, state, progress, speed, eta = await asyncio.wait_for(
+                        queue.get(), PROGRESS_STREAM_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                data = orjson.dumps({
+                    "video_id": video_id,
+                    "status": state,
+                    "progress": progress,
+                    "speed": speed,
+                    "eta": eta
+                })
+                yield b"event: progress\ndata: " + data + b"\n\n"
+        finally:
+            downloader.unsubscribe(queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @router.post("/{download_id}/pause")
 async def pause_download(
     download_id: int,
@@ -207,8 +296,7 @@ async def resume_download(
     )
     
     # Re-process download
-    import asyncio
-    asyncio.create_task(downloader._process_download(download['video_id']))
+    downloader.dispatch_download(download_id, download['priority'] or 0)
     
     return {"message": "Download resumed"}
 
@@ -264,8 +352,7 @@ async def retry_download(
     )
     
     # Re-process download
-    import asyncio
-    asyncio.create_task(downloader._process_download(download['video_id']))
+    downloader.dispatch_download(download_id, download['priority'] or 0)
     
     return {"message": "Download retry queued"}
 
@@ -293,7 +380,7 @@ async def cancel_download(
         )
     
     # Attempt to cancel if active
-    await downloader.cancel_download(download['video_id'])
+    await downloader.cancel_download(download['video_id'], download_id)
     
     # Delete from queue
     await db.delete("job_queue", "id = ?", (download_id,))
@@ -365,7 +452,6 @@ async def retry_all_failed(
         )
         
         # Re-process download
-        import asyncio
-        asyncio.create_task(downloader._process_download(download['video_id']))
+        downloader.dispatch_download(download['id'], download['priority'] or 0)
     
     return {"message": f"Retrying {len(failed_downloads)} failed downloads"} 
\ No newline at end of file
@@ -9,7 +9,7 @@ from apscheduler.triggers.cron import CronTrigger
 
 logger = logging.getLogger(__name__)
 
-from app.core.database import Database
+from app.core.database import Database, utc_timestamp
 from app.core.downloader import Downloader
 from app.core.security import SessionBearer, SecurityManager
 from app.core.metadata import classify_video_type
@@ -241,8 +241,8 @@ async def create_subscription(
         channel_id = await db.insert("channels", {
             "youtube_id": channel_id_yt,
             "name": channel_name,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
+            "created_at": utc_timestamp(),
+            "updated_at": utc_timestamp()
         })
     else:
         channel_id = channel['id']
@@ -262,7 +262,7 @@ async def create_subscription(
     # Create subscription
     sub_data = subscription_data.dict()
     sub_data['channel_id'] = channel_id
-    sub_data['created_at'] = datetime.utcnow().isoformat()
+    sub_data['created_at'] = utc_timestamp()
     
     if sub_data.get('subtitle_languages'):
         sub_data['subtitle_languages'] = Database.json_encode(sub_data['subtitle_languages'])
@@ -397,6 +397,7 @@ async def update_subscription(
 async def delete_subscription(
     subscription_id: int,
     db: Database = Depends(get_db),
+    downloader: Downloader = Depends(get_downloader),
     scheduler = Depends(get_scheduler),
     _: dict = Depends(get_auth)
 ):
@@ -405,7 +406,7 @@ async def delete_subscription(
     """
     # Check if subscription exists
     existing = await db.execute_one(
-        "SELECT id FROM subscriptions WHERE id = ?",
+        "SELECT id, source_url FROM subscriptions WHERE id = ?",
         (subscription_id,)
     )
     
@@ -415,6 +416,9 @@ async def delete_subscription(
             detail="Subscription not found"
         )
     
+    # Re-adding the same URL right away should see the channel as it is now
+    downloader.invalidate_extract_info(existing['source_url'])
+    
     # Remove from scheduler
     await scheduler.remove_subscription(subscription_id)
     
@@ -449,6 +453,9 @@ async def check_subscription(
             detail="Subscription not found"
         )
     
+    # A manual check is a refresh: don't serve this channel's info from the extract cache
+    downloader.invalidate_extract_info(subscription['source_url'])
+    
     # Queue subscription discovery job with high priority (manual request)
     job_id = await downloader.queue_subscription_discovery(subscription_id, priority=3)
     
@@ -457,7 +464,7 @@ async def check_subscription(
         "subscription_id": subscription_id,
         "channel_name": subscription['channel_name'],
         "job_id": job_id,
-        "queued_at": datetime.utcnow().isoformat()
+        "queued_at": utc_timestamp()
     }
 
 
@@ -1,12 +1,17 @@
 """
 Video management endpoints
 """
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import groupby, product
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import FileResponse
-from datetime import datetime
+import logging
 import mimetypes
+import time
 
 from app.core.config import settings
 from app.core.database import Database
@@ -19,8 +24,51 @@ from app.models.video import (
     VideoDownloadRequest, VideoBulkOperation
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Seconds a cached list page stays servable; also bounds how long writes made
+# by another worker process (which don't bump this process's generation) go unseen
+LIST_CACHE_TTL = 30.0
+# Most cached list pages kept at once
+LIST_CACHE_SIZE = 64
+
+
+class VideoListCache:
+    """Recently served video list pages, bounded in size and age
+
+    Each page is stored with the database's videos_generation from before it was
+    read, and is only served while that generation is still current.
+    """
+    
+    def __init__(self, maxsize: int = LIST_CACHE_SIZE, ttl: float = LIST_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._pages: OrderedDict = OrderedDict()  # key -> (expires_at, generation, response)
+    
+    def get(self, key: tuple, generation: int) -> Optional[VideoListResponse]:
+        """Return the cached page if it is still fresh, dropping it otherwise"""
+        entry = self._pages.get(key)
+        if entry is None:
+            return None
+        if entry[0] > time.monotonic() and entry[1] == generation:
+            return entry[2]
+        del self._pages[key]
+        return None
+    
+    def put(self, key: tuple, generation: int, response: VideoListResponse):
+        """Store a page read at generation, evicting expired and then oldest pages"""
+        now = time.monotonic()
+        pages = self._pages
+        # Pages share one TTL, so the expired ones are all at the front
+        while pages and next(iter(pages.values()))[0] <= now:
+            pages.popitem(last=False)
+        pages.pop(key, None)
+        pages[key] = (now + self.ttl, generation, response)
+        while len(pages) > self.maxsize:
+            pages.popitem(last=False)
+
 
 def get_db(request: Request) -> Database:
     """Get database from app state"""
@@ -40,92 +88,142 @@ def get_auth(request: Request) -> SessionBearer:
     return SessionBearer(security_manager)
 
 
-@router.get("", response_model=VideoListResponse)
-async def list_videos(
-    request: Request,
-    page: int = Query(1, ge=1),
-    per_page: int = Query(50, ge=1, le=100),
-    channel_id: Optional[int] = None,
-    status: Optional[str] = None,
-    search: Optional[str] = None,
-    db: Database = Depends(get_db),
-    _: dict = Depends(get_auth)
-):
-    """
-    List videos with filtering and pagination
-    """
-    offset = (page - 1) * per_page
-    
-    # Build query
+def get_list_cache(request: Request) -> VideoListCache:
+    """Get cached video list pages from app state"""
+    if not hasattr(request.app.state, 'list_cache'):
+        request.app.state.list_cache = VideoListCache()
+    return request.app.state.list_cache
+
+
+def _build_list_queries(by_channel: bool, by_status: bool, by_search: bool) -> Tuple[str, str]:
+    """Build the count and page SQL for one combination of list filters"""
     where_clauses = ["1=1"]
-    params = []
-    
-    if channel_id:
+    search_join = ""
+    order_by = "v.created_at DESC"
+    if by_channel:
         where_clauses.append("v.channel_id = ?")
-        params.append(channel_id)
-    
-    if status:
+    if by_status:
         where_clauses.append("v.download_status = ?")
-        params.append(status)
-    
-    if search:
-        where_clauses.append("(v.title LIKE ? OR v.description LIKE ?)")
-        search_param = f"%{search}%"
-        params.extend([search_param, search_param])
-    
+    if by_search:
+        # Full-text index lookup instead of a LIKE '%...%' table scan
+        search_join = "JOIN videos_fts ON videos_fts.rowid = v.id"
+        where_clauses.append("videos_fts MATCH ?")
+        order_by = "bm25(videos_fts)"
     where_clause = " AND ".join(where_clauses)
     
-    # Get total count
-    count_query = f"SELECT COUNT(*) as total FROM videos v WHERE {where_clause}"
-    total_result = await db.execute_one(count_query, tuple(params))
-    total = total_result['total'] if total_result else 0
-    
-    # Get videos
-    query = f"""
+    count_query = f"SELECT COUNT(*) as total FROM videos v {search_join} WHERE {where_clause}"
+    page_query = f"""
         SELECT v.*, c.name as channel_name
         FROM videos v
         JOIN channels c ON v.channel_id = c.id
+        {search_join}
         WHERE {where_clause}
-        ORDER BY v.created_at DESC
+        ORDER BY {order_by}
         LIMIT ? OFFSET ?
     """
-    params.extend([per_page, offset])
-    videos = await db.execute(query, tuple(params))
+    return count_query, page_query
+
+
+def _fts_match_expression(search: str) -> str:
+    """Turn free-text search input into an FTS5 query of quoted prefix terms"""
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in search.split())
+
+
+# (channel_id set, status set, search set) -> (count SQL, page SQL)
+_LIST_QUERIES = {
+    key: _build_list_queries(*key) for key in product((False, True), repeat=3)
+}
+
+
+@lru_cache(maxsize=128)
+def _video_tags_query(count: int) -> str:
+    """Tags lookup SQL for a page of `count` video ids"""
+    return """
+        SELECT vt.video_id, t.id, t.name, t.color
+        FROM video_tags vt
+        JOIN tags t ON vt.tag_id = t.id
+        WHERE vt.video_id IN ({})
+        ORDER BY vt.video_id
+    """.format(','.join('?' * count))
+
+
+async def _fetch_video_page(
+    db: Database,
+    page: int,
+    per_page: int,
+    channel_id: Optional[int],
+    status: Optional[str],
+    search: Optional[str]
+) -> VideoListResponse:
+    """Run the count, page and tag queries for one page of the video list"""
+    offset = (page - 1) * per_page
+    match = _fts_match_expression(search) if search else ""
+    count_query, query = _LIST_QUERIES[bool(channel_id), bool(status), bool(match)]
+    
+    params = ()
+    if channel_id:
+        params += (channel_id,)
+    if status:
+        params += (status,)
+    if match:
+        params += (match,)
+    
+    # Get total count
+    total_result = await db.execute_one(count_query, params)
+    total = total_result['total'] if total_result else 0
+    
+    # Get videos
+    videos = await db.execute_model(query, params + (per_page, offset), VideoResponse)
     
     # Get tags for videos
-    video_ids = [v['id'] for v in videos]
+    video_ids = tuple(v.id for v in videos)
     if video_ids:
-        tags_query = """
-            SELECT vt.video_id, t.id, t.name, t.color
-            FROM video_tags vt
-            JOIN tags t ON vt.tag_id = t.id
-            WHERE vt.video_id IN ({})
-        """.format(','.join('?' * len(video_ids)))
-        tags_result = await db.execute(tags_query, tuple(video_ids))
-        
-        # Group tags by video
-        video_tags = {}
-        for tag in tags_result:
-            if tag['video_id'] not in video_tags:
-                video_tags[tag['video_id']] = []
-            video_tags[tag['video_id']].append({
-                'id': tag['id'],
-                'name': tag['name'],
-                'color': tag['color']
-            })
+        # (video_id, id, name, color) tuples sorted by video, so grouping is one linear pass
+        tag_rows = await db.execute_rows(_video_tags_query(len(video_ids)), video_ids)
+        video_tags = {
+            tag_video_id: [{'id': row[1], 'name': row[2], 'color': row[3]} for row in rows]
+            for tag_video_id, rows in groupby(tag_rows, key=itemgetter(0))
+        }
         
         # Add tags to videos
         for video in videos:
-            video['tags'] = video_tags.get(video['id'], [])
+            video.tags = video_tags.get(video.id, [])
     
     return VideoListResponse(
-        videos=[VideoResponse(**v) for v in videos],
+        videos=videos,
         total=total,
         page=page,
         per_page=per_page
     )
 
 
+@router.get("", response_model=VideoListResponse)
+async def list_videos(
+    request: Request,
+    page: int = Query(1, ge=1),
+    per_page: int = Query(50, ge=1, le=100),
+    channel_id: Optional[int] = None,
+    status: Optional[str] = None,
+    search: Optional[str] = None,
+    db: Database = Depends(get_db),
+    list_cache: VideoListCache = Depends(get_list_cache),
+    _: dict = Depends(get_auth)
+):
+    """
+    List videos with filtering and pagination
+    """
+    # Serve a cached page if nothing has been written since it was read
+    key = (channel_id, status, search, page, per_page)
+    generation = db.videos_generation
+    response = list_cache.get(key, generation)
+    if response is None:
+        response = await _fetch_video_page(db, page, per_page, channel_id, status, search)
+        if db.videos_generation == generation:  # Don't cache a page that went stale while loading
+            list_cache.put(key, generation, response)
+    
+    return response
+
+
 @router.get("/{video_id}", response_model=VideoResponse)
 async def get_video(
     video_id: int,
@@ -280,37 +378,21 @@ async def create_video(
                 }
             )
     
-    # Check if video already exists
-    existing = await db.execute_one(
-        "SELECT id FROM videos WHERE youtube_id = ?",
-        (youtube_id,)
-    )
-    
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Video already exists"
+    # Create the channel, or look up the existing one without touching it
+    # (created_at/updated_at are filled in by the column defaults)
+    channel_id = await db.insert_or_ignore("channels", {
+        "youtube_id": channel_id_yt,
+        "name": channel_info or "Unknown Channel"
+    }, conflict_column="youtube_id")
+    if channel_id is None:
+        channel = await db.execute_one(
+            "SELECT id FROM channels WHERE youtube_id = ?",
+            (channel_id_yt,)
         )
-    
-    # Create or get channel
-    channel = await db.execute_one(
-        "SELECT id FROM channels WHERE youtube_id = ?",
-        (channel_id_yt,)
-    )
-    
-    if not channel:
-        # Create channel
-        channel_id = await db.insert("channels", {
-            "youtube_id": channel_id_yt,
-            "name": channel_info or "Unknown Channel",
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
-        })
-    else:
         channel_id = channel['id']
     
-    # Create video
-    video_id = await db.insert("videos", {
+    # Create video, relying on the youtube_id unique constraint to detect duplicates
+    video_id = await db.insert_or_ignore("videos", {
         "youtube_id": youtube_id,
         "channel_id": channel_id,
         "title": info.get('title', 'Unknown Title'),
@@ -320,10 +402,14 @@ async def create_video(
         "view_count": info.get('view_count'),
         "like_count": info.get('like_count'),
         "video_type": classify_video_type(info),
-        "download_status": "pending",
-        "created_at": datetime.utcnow().isoformat(),
-        "updated_at": datetime.utcnow().isoformat()
-    })
+        "download_status": "pending"
+    }, conflict_column="youtube_id")
+    
+    if video_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Video already exists"
+        )
     
     # Resolve quality preference and auto-queue download
     # TODO: Extract user_id from auth context when available
@@ -366,8 +452,7 @@ async def update_video(
     # Update video
     update_data = video_update.dict(exclude_unset=True)
     if update_data:
-        update_data['updated_at'] = datetime.utcnow().isoformat()
-        
+        # updated_at is maintained by the update_videos_timestamp trigger
         if 'extra_metadata' in update_data:
             update_data['extra_metadata'] = Database.json_encode(update_data['extra_metadata'])
         
@@ -1,13 +1,35 @@
 """
 Configuration management for YouHoard
 """
+from dataclasses import field, make_dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
-class Settings(BaseSettings):
-    """Application settings"""
+class _TitleCharTable(dict):
+    """str.translate table keeping alphanumerics, space, '-' and '_'; filled in per code point"""
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        value = codepoint if char.isalnum() or char in ' -_' else None
+        self[codepoint] = value
+        return value
+
+
+# Shared by all directory-name sanitization (channel and video directories)
+_TITLE_CHARS = _TitleCharTable()
+
+
+@lru_cache(maxsize=256)
+def _channel_dir_name(channel_youtube_id: str, channel_name: Optional[str]) -> str:
+    """{youtube_id}_{sanitized name}; cached since the same few channels recur on every download"""
+    safe_name = (channel_name or '').translate(_TITLE_CHARS).strip().replace(' ', '_')[:50]
+    return f"{channel_youtube_id}_{safe_name}"
+
+
+class _EnvSettings(BaseSettings):
+    """Application settings as parsed from the environment and .env"""
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -83,27 +105,60 @@ class Settings(BaseSettings):
     YTDLP_PLAYLIST_LIMIT: int = 50  # Maximum playlist items to process at once
     PLAYLIST_BATCH_SIZE: int = 50  # Process playlists in batches to avoid overload
     YTDLP_VERBOSE: bool = True  # Enable verbose output from yt-dlp for debugging
+    YTDLP_CACHE_DIR: Optional[str] = None  # Player JS/signature cache; defaults to STORAGE_PATH/.ytdlp-cache
     
     # Server settings
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+
+
+class _SettingsBase:
+    """Derived paths and helpers for Settings, whose fields come from _EnvSettings"""
+    __slots__ = ()
+    
+    # Derived paths, computed once instead of on every call
+    _DERIVED_PATHS = ('storage_path', 'temp_path', 'log_dir', 'log_file_path', 'ytdlp_cache_dir')
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'storage_path', Path(self.STORAGE_PATH))
+        object.__setattr__(self, 'temp_path', Path(self.TEMP_PATH))
+        object.__setattr__(self, 'log_dir', Path(self.LOG_DIR))
+        object.__setattr__(self, 'log_file_path', self.log_dir / self.LOG_FILE)
+        object.__setattr__(self, 'ytdlp_cache_dir',
+                           Path(self.YTDLP_CACHE_DIR) if self.YTDLP_CACHE_DIR else self.storage_path / '.ytdlp-cache')
     
     def get_storage_path(self) -> Path:
         """Get storage path as Path object"""
-        return Path(self.STORAGE_PATH)
+        return self.storage_path
     
     def get_temp_path(self) -> Path:
         """Get temp path as Path object"""
-        return Path(self.TEMP_PATH)
+        return self.temp_path
 
     def get_log_dir(self) -> Path:
         """Get log directory as Path object"""
-        return Path(self.LOG_DIR)
+        return self.log_dir
 
     def get_log_file_path(self) -> Path:
         """Get full log file path"""
-        return self.get_log_dir() / self.LOG_FILE
+        return self.log_file_path
+
+    def get_channel_path(self, channel_youtube_id: str, channel_name: str) -> Path:
+        """Get a channel's storage directory: channels/{youtube_id}_{sanitized name}"""
+        return self.storage_path / "channels" / _channel_dir_name(channel_youtube_id, channel_name)
+
+
+# Application settings, frozen after the environment is parsed once at import.
+# Fields mirror _EnvSettings, so a new setting is declared in one place only
+Settings = make_dataclass(
+    'Settings',
+    [(name, info.annotation) for name, info in _EnvSettings.model_fields.items()]
+    + [(name, Path, field(init=False)) for name in _SettingsBase._DERIVED_PATHS],
+    bases=(_SettingsBase,),
+    frozen=True,
+    slots=True,
+)
 
 
 # Global settings instance
-settings = Settings() 
\ No newline at end of file
+settings = Settings(**_EnvSettings().model_dump())
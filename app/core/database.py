@@ -1,11 +1,42 @@
 """
 Database management for YouHoard using aiosqlite
 """
-import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
 from contextlib import asynccontextmanager
+import re
+import time
 import aiosqlite
+import orjson
 from pathlib import Path
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Seconds a connection waits on a locked database before raising SQLITE_BUSY
+BUSY_TIMEOUT = 5.0
+
+# Schema is small and fixed, so read it once at import rather than inside init_db
+_SCHEMA_PATH = Path(__file__).parent.parent.parent / "schema.sql"
+_SCHEMA_SQL = _SCHEMA_PATH.read_text() if _SCHEMA_PATH.exists() else None
+
+# Bumped when init_db has to upgrade databases created by an older schema (PRAGMA user_version)
+SCHEMA_VERSION = 1
+
+# Format of every stored timestamp, matching strftime('%Y-%m-%dT%H:%M:%fZ') in the schema
+TIMESTAMP_SQL_FORMAT = '%Y-%m-%dT%H:%M:%fZ'
+# Triggers that stamped updated_at with CURRENT_TIMESTAMP before SCHEMA_VERSION 1
+_TIMESTAMP_TRIGGERS = ('update_channels_timestamp', 'update_videos_timestamp', 'update_settings_timestamp')
+
+# Tables the video list reads; writing any of them makes cached list pages stale
+_VIDEO_LIST_TABLES = frozenset({'videos', 'channels', 'tags', 'video_tags'})
+# Target table of a raw INSERT/UPDATE/DELETE statement
+_WRITE_TABLE_RE = re.compile(r'^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|UPDATE|DELETE\s+FROM)\s+(\w+)', re.IGNORECASE)
+
+
+def utc_timestamp() -> str:
+    """Current UTC time in the schema's timestamp format, e.g. 2024-01-31T12:00:00.000Z"""
+    now = time.time()
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now))}.{int(now * 1000) % 1000:03d}Z"
 
 
 class Database:
@@ -13,31 +44,93 @@ class Database:
     
     def __init__(self, db_path: str):
         self.db_path = db_path
+        # Bumped on every write to a video list table, so caches can tell their data is stale
+        self.videos_generation = 0
+    
+    def _wrote(self, table: str):
+        """Record a committed write to table"""
+        if table in _VIDEO_LIST_TABLES:
+            self.videos_generation += 1
+    
+    def _wrote_sql(self, query: str):
+        """Record a committed write made with raw SQL"""
+        match = _WRITE_TABLE_RE.match(query)
+        if match:
+            self._wrote(match.group(1).lower())
     
     @asynccontextmanager
     async def get_db(self):
         """Get database connection context manager"""
-        async with aiosqlite.connect(self.db_path) as db:
+        # timeout is SQLite's busy timeout: wait on a locked database instead of raising
+        async with aiosqlite.connect(self.db_path, timeout=BUSY_TIMEOUT) as db:
             db.row_factory = aiosqlite.Row  # Dict-like row access
+            # Safe under WAL and skips an fsync per commit
+            await db.execute("PRAGMA synchronous = NORMAL")
             yield db
     
     async def init_db(self):
         """Initialize database with schema"""
-        schema_path = Path(__file__).parent.parent.parent / "schema.sql"
-        
         async with self.get_db() as db:
+            # WAL lets readers run alongside the single writer; the mode is
+            # persisted in the database file, so setting it once here is enough
+            await db.execute("PRAGMA journal_mode = WAL")
+            
             # Check if database already has tables
             async with db.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='videos'"
+                "SELECT name FROM sqlite_master WHERE type='table' AND name IN ('videos', 'videos_fts')"
             ) as cursor:
-                if await cursor.fetchone():
-                    return  # Database already initialized
+                existing = {row['name'] for row in await cursor.fetchall()}
+            async with db.execute("PRAGMA user_version") as cursor:
+                version = (await cursor.fetchone())[0]
+            if 'videos_fts' in existing and version >= SCHEMA_VERSION:
+                return  # Database already initialized
+            
+            if not _SCHEMA_SQL:
+                return
+            upgrading = 'videos' in existing and version < 1
+            if upgrading:
+                # Old triggers stamp CURRENT_TIMESTAMP; drop them so the schema re-creates them
+                for trigger in _TIMESTAMP_TRIGGERS:
+                    await db.execute(f"DROP TRIGGER IF EXISTS {trigger}")
             
-            # Load and execute schema
-            if schema_path.exists():
-                with open(schema_path, 'r') as f:
-                    await db.executescript(f.read())
-                await db.commit()
+            # Execute schema (every statement is IF NOT EXISTS, so this also
+            # upgrades databases created before the search index existed)
+            await db.executescript(_SCHEMA_SQL)
+            if 'videos' in existing and 'videos_fts' not in existing:
+                # Index the videos that predate the search table
+                await db.execute("INSERT INTO videos_fts(videos_fts) VALUES ('rebuild')")
+            if upgrading:
+                await self._migrate_timestamps(db)
+            await db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            await db.commit()
+    
+    async def _migrate_timestamps(self, db: aiosqlite.Connection):
+        """Rewrite stored timestamps in the schema format and stamp new rows the same way
+        
+        Column defaults can't be altered in place, so tables still defaulting to
+        CURRENT_TIMESTAMP get a trigger that reformats the value after each insert.
+        """
+        async with db.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' "
+            "AND name NOT LIKE 'videos_fts%' AND name != 'sessions'"
+        ) as cursor:
+            tables = [row['name'] for row in await cursor.fetchall()]
+        for table in tables:
+            async with db.execute(f"PRAGMA table_info({table})") as cursor:
+                columns = [row for row in await cursor.fetchall() if row['type'].upper() == 'TIMESTAMP']
+            for column in columns:
+                name = column['name']
+                await db.execute(
+                    f"UPDATE {table} SET {name} = COALESCE(strftime('{TIMESTAMP_SQL_FORMAT}', {name}), {name}) "
+                    f"WHERE {name} IS NOT NULL AND {name} NOT LIKE '%Z'"
+                )
+                if (column['dflt_value'] or '').upper() == 'CURRENT_TIMESTAMP':
+                    await db.execute(
+                        f"CREATE TRIGGER IF NOT EXISTS {table}_{name}_format AFTER INSERT ON {table} "
+                        f"WHEN NEW.{name} NOT LIKE '%Z' BEGIN "
+                        f"UPDATE {table} SET {name} = strftime('{TIMESTAMP_SQL_FORMAT}', NEW.{name}) WHERE rowid = NEW.rowid; "
+                        f"END"
+                    )
     
     async def execute(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """Execute a query and return all results"""
@@ -45,6 +138,22 @@ class Database:
             async with db.execute(query, params or ()) as cursor:
                 return [dict(row) for row in await cursor.fetchall()]
     
+    async def execute_rows(self, query: str, params: Optional[tuple] = None) -> List[tuple]:
+        """Execute a query and return all results as plain tuples"""
+        async with self.get_db() as db:
+            db.row_factory = None
+            async with db.execute(query, params or ()) as cursor:
+                return await cursor.fetchall()
+    
+    async def execute_model(self, query: str, params: Optional[tuple], model: Type[ModelT]) -> List[ModelT]:
+        """Execute a query and build Pydantic models straight from the result rows"""
+        async with self.get_db() as db:
+            async with db.execute(query, params or ()) as cursor:
+                cols = [d[0] for d in cursor.description]
+                rows = await cursor.fetchall()
+        validate = model.model_validate
+        return [validate(dict(zip(cols, row))) for row in rows]
+    
     async def execute_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
         """Execute query and return first result"""
         results = await self.execute(query, params)
@@ -55,6 +164,7 @@ class Database:
         async with self.get_db() as db:
             await db.executemany(query, params_list)
             await db.commit()
+        self._wrote_sql(query)
     
     async def insert(self, table: str, data: Dict[str, Any]) -> int:
         """Insert data and return last row id"""
@@ -65,7 +175,54 @@ class Database:
         async with self.get_db() as db:
             cursor = await db.execute(query, tuple(data.values()))
             await db.commit()
-            return cursor.lastrowid
+        self._wrote(table)
+        return cursor.lastrowid
+
+    async def insert_many(self, table: str, rows: List[Dict[str, Any]], key_column: str) -> Dict[Any, int]:
+        """Insert rows sharing the same columns in one transaction; return {key_column value: row id}
+
+        Rows whose key_column already exists (in the table or earlier in rows) are
+        skipped and left out of the result, so it holds only the rows inserted here.
+        """
+        if not rows:
+            return {}
+        columns = list(rows[0].keys())
+        placeholders = ', '.join('?' * len(columns))
+        query = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT({key_column}) DO NOTHING RETURNING {key_column}, id"
+        )
+        
+        ids = {}
+        async with self.get_db() as db:
+            for row in rows:
+                async with db.execute(query, tuple(row[c] for c in columns)) as cursor:
+                    inserted = await cursor.fetchone()
+                if inserted:
+                    ids[inserted[0]] = inserted[1]
+            await db.commit()
+        self._wrote(table)
+        return ids
+
+    async def insert_or_ignore(self, table: str, data: Dict[str, Any], conflict_column: str) -> Optional[int]:
+        """Insert data unless it conflicts on conflict_column; return new row id or None"""
+        columns = ', '.join(data.keys())
+        placeholders = ', '.join('?' * len(data))
+        query = (
+            f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) "
+            f"ON CONFLICT({conflict_column}) DO NOTHING RETURNING id"
+        )
+        row = await self.execute_returning(query, tuple(data.values()))
+        return row['id'] if row else None
+    
+    async def execute_returning(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        """Execute a write query with a RETURNING clause, commit, and return the first row"""
+        async with self.get_db() as db:
+            async with db.execute(query, params or ()) as cursor:
+                row = await cursor.fetchone()
+            await db.commit()
+        self._wrote_sql(query)
+        return dict(row) if row else None
     
     async def update(self, table: str, data: Dict[str, Any], where: str, where_params: tuple) -> int:
         """Update data and return affected rows"""
@@ -76,7 +233,21 @@ class Database:
         async with self.get_db() as db:
             cursor = await db.execute(query, params)
             await db.commit()
-            return cursor.rowcount
+        self._wrote(table)
+        return cursor.rowcount
+    
+    async def update_many(self, updates: List[Tuple[str, Dict[str, Any], str, tuple]]) -> None:
+        """Apply several (table, data, where, where_params) updates in one transaction"""
+        async with self.get_db() as db:
+            for table, data, where, where_params in updates:
+                set_clause = ', '.join(f"{k} = ?" for k in data.keys())
+                await db.execute(
+                    f"UPDATE {table} SET {set_clause} WHERE {where}",
+                    tuple(data.values()) + where_params
+                )
+            await db.commit()
+        for table, *_ in updates:
+            self._wrote(table)
     
     async def delete(self, table: str, where: str, params: tuple) -> int:
         """Delete data and return affected rows"""
@@ -85,18 +256,19 @@ class Database:
         async with self.get_db() as db:
             cursor = await db.execute(query, params)
             await db.commit()
-            return cursor.rowcount
+        self._wrote(table)
+        return cursor.rowcount
     
     # JSON field helpers
     @staticmethod
     def json_encode(data: Any) -> str:
         """Encode data as JSON for storage"""
-        return json.dumps(data) if data is not None else None
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode() if data is not None else None
     
     @staticmethod
     def json_decode(data: str) -> Any:
         """Decode JSON data from storage"""
-        return json.loads(data) if data else None
+        return orjson.loads(data) if data else None
     
     async def get_videos(self, limit: int = 50, offset: int = 0, 
                         channel_id: Optional[int] = None,
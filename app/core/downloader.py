@@ -2,22 +2,126 @@
 YouTube downloader using yt-dlp
 """
 import asyncio
-import json
+import itertools
+import logging
+import mmap
+import os
+import shutil
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any, Callable
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Callable, List, Mapping, Set, Tuple
+import orjson
 import yt_dlp
-from datetime import datetime
 
-from app.core.config import settings
-from app.core.database import Database
+from app.core.config import settings, _TITLE_CHARS
+from app.core.database import Database, utc_timestamp
 from app.core.metadata import MetadataManager
 from app.core.quality import QualityService
 from app.core.ytdlp_service import get_ytdlp_service
 
+logger = logging.getLogger(__name__)
+
+# Thumbnail file names in order of preference; JPG first since we convert to JPG
+_THUMBNAIL_NAMES = ('thumbnail.jpg', 'thumbnail.jpeg', 'thumbnail.png', 'thumbnail.webp')
+
+# Fields kept from a metadata extraction; the full info dict (formats, thumbnails,
+# player responses) runs to megabytes and job status responses only need a summary
+_METADATA_RESULT_FIELDS = (
+    'id', 'title', 'description', 'duration', 'upload_date', 'channel', 'channel_id',
+    'channel_url', 'uploader', 'thumbnail', 'webpage_url', 'tags', 'view_count',
+    'like_count', 'live_status',
+)
+
+# extract_info results are reused for a while, e.g. when adding a URL is retried
+EXTRACT_INFO_CACHE_TTL = 300.0  # seconds
+EXTRACT_INFO_CACHE_SIZE = 256
+
+# Resolved once at import rather than searching PATH for every download
+_FFMPEG_PATH = shutil.which('ffmpeg')
+
+
+def _entry_upload_date(entry: Dict[str, Any]) -> Optional[str]:
+    """upload_date (YYYYMMDD) of a flat playlist entry, falling back to its timestamp"""
+    upload_date = entry.get('upload_date')
+    if upload_date:
+        return upload_date
+    timestamp = entry.get('timestamp') or entry.get('release_timestamp')
+    if timestamp:
+        return time.strftime('%Y%m%d', time.gmtime(timestamp))
+    return None
+
+
+def _load_info_json(path: Path) -> Dict[str, Any]:
+    """Read and parse a yt-dlp info.json; run it off the event loop, these can be megabytes"""
+    with open(path, 'rb') as f:
+        # Parse straight from the page cache instead of copying the file into a bytes object
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            return orjson.loads(view)
+
+
+@lru_cache(maxsize=16)
+def _ydl_opts_template(quality: Optional[str]) -> Mapping[str, Any]:
+    """yt-dlp options shared by every download at ``quality``
+
+    The cached template is frozen all the way down (read-only mappings, tuples);
+    get_ydl_opts thaws a copy and adds the per-download fields.
+    """
+    # Use provided quality or fall back to default
+    format_selector = settings.FORMAT_SELECTOR
+    if quality:
+        format_selector = QualityService.get_format_selector(quality)
+        
+    opts = {
+        'format': format_selector,
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': False,
+        'writeinfojson': settings.WRITE_INFO_JSON,
+        'writethumbnail': settings.WRITE_THUMBNAIL,
+        'write_subs': True,
+        'write_auto_subs': True,
+        'sub_langs': tuple(settings.SUBTITLE_LANGUAGES),
+        # Format compatibility settings
+        'merge_output_format': settings.MERGE_OUTPUT_FORMAT,
+        'remux_video': settings.REMUX_VIDEO,
+        'format_sort': tuple(settings.FORMAT_SORT)
+    }
+    
+    # Explicitly set ffmpeg path if found
+    if _FFMPEG_PATH:
+        opts['ffmpeg_location'] = _FFMPEG_PATH
+    
+    postprocessors = []
+    if settings.EMBED_SUBS:
+        postprocessors.append({
+            'key': 'FFmpegEmbedSubtitle',
+            'already_have_subtitle': False
+        })
+    
+    # Convert thumbnails to JPG format
+    postprocessors.append({
+        'key': 'FFmpegThumbnailsConvertor',
+        'format': 'jpg',
+        'when': 'before_dl'
+    })
+    opts['postprocessors'] = tuple(MappingProxyType(pp) for pp in postprocessors)
+    
+    return MappingProxyType(opts)
+
 
 class DownloadProgress:
-    """Track download progress"""
-    def __init__(self, video_id: int, loop: asyncio.AbstractEventLoop, callback: Optional[Callable] = None):
+    """Track download progress
+
+    ``callback(video_id, progress)`` is invoked on ``loop`` after each update.
+    """
+    # yt-dlp fires the hook every few KB; only pass on meaningful changes.
+    # The UI shows whole percents, so finer steps are never visible.
+    MIN_PROGRESS_DELTA = 1.0  # percent
+    MIN_PROGRESS_INTERVAL = 0.5  # seconds
+    
+    def __init__(self, video_id: int, loop: asyncio.AbstractEventLoop, callback: Optional[Callable[[int, float], None]] = None):
         self.video_id = video_id
         self.callback = callback
         self.loop = loop
@@ -26,30 +130,38 @@ class DownloadProgress:
         self.speed = None
         self.eta = None
         self.error = None
+        self.cancelled = False  # Set by cancel_download; the progress hook aborts yt-dlp
+        self._last_pct = -1.0
+        self._last_ts = 0.0
     
     def update(self, d: dict):
         """Update progress from yt-dlp hook"""
-        if d['status'] == 'downloading':
+        status = d['status']
+        get = d.get
+        if status == 'downloading':
             self.status = 'downloading'
-            if d.get('total_bytes'):
-                self.progress = (d.get('downloaded_bytes', 0) / d['total_bytes']) * 100
-            elif d.get('total_bytes_estimate'):
-                self.progress = (d.get('downloaded_bytes', 0) / d['total_bytes_estimate']) * 100
-            self.speed = d.get('speed')
-            self.eta = d.get('eta')
-        elif d['status'] == 'finished':
+            total = get('total_bytes') or get('total_bytes_estimate')
+            if total:
+                self.progress = (get('downloaded_bytes', 0) / total) * 100
+            self.speed = get('speed')
+            self.eta = get('eta')
+            
+            now = time.monotonic()
+            if (abs(self.progress - self._last_pct) < self.MIN_PROGRESS_DELTA
+                    and now - self._last_ts < self.MIN_PROGRESS_INTERVAL):
+                return
+            self._last_pct = self.progress
+            self._last_ts = now
+        elif status == 'finished':
             self.status = 'completed'
             self.progress = 100.0
-        elif d['status'] == 'error':
+        elif status == 'error':
             self.status = 'failed'
-            self.error = str(d.get('error', 'Unknown error'))
+            self.error = str(get('error', 'Unknown error'))
         
         if self.callback:
-            # Schedule the async callback on the event loop
-            if asyncio.iscoroutinefunction(self.callback):
-                asyncio.run_coroutine_threadsafe(self.callback(self), self.loop)
-            else:
-                self.callback(self)
+            # Hooks run on the yt-dlp thread; hand the plain value to the loop
+            self.loop.call_soon_threadsafe(self.callback, self.video_id, self.progress)
 
 
 class Downloader:
@@ -58,200 +170,189 @@ class Downloader:
     def __init__(self, db: Database):
         self.db = db
         self.active_downloads = {}  # Keep this name for backward compatibility  
+        self._storage_root = settings.get_storage_path()
+        self.active_version = 0  # Bumped whenever active_downloads or their progress change
         self.active_tasks = {}  # New: track asyncio.Tasks for cancellation
-        self._semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_DOWNLOADS)
+        # Download jobs wait here as (-priority, seq, queue_id); MAX_CONCURRENT_DOWNLOADS
+        # workers drain it, so higher priority jobs start first and ties stay FIFO
+        self._download_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._download_seq = itertools.count()
+        self._download_workers: List[asyncio.Task] = []
+        # Live progress goes to in-process subscribers; the DB only sees status transitions
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}  # url -> (expires_at, info)
     
     def get_ydl_opts(self, output_path: Path, quality: Optional[str] = None, progress_hook: Optional[Callable] = None) -> dict:
         """Get yt-dlp options"""
-        import shutil
-        
-        # Use provided quality or fall back to default
-        format_selector = settings.FORMAT_SELECTOR
-        if quality:
-            format_selector = QualityService.get_format_selector(quality)
-            
-        opts = {
-            'format': format_selector,
-            'outtmpl': {
-                'default': str(output_path / 'video.%(ext)s'),
-                'thumbnail': str(output_path / 'thumbnail.%(ext)s'),
-            },
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': False,
-            'writeinfojson': settings.WRITE_INFO_JSON,
-            'writethumbnail': settings.WRITE_THUMBNAIL,
-            'write_subs': True,
-            'write_auto_subs': True,
-            'sub_langs': settings.SUBTITLE_LANGUAGES,
-            'postprocessors': [],
-            # Format compatibility settings
-            'merge_output_format': settings.MERGE_OUTPUT_FORMAT,
-            'remux_video': settings.REMUX_VIDEO,
-            'format_sort': settings.FORMAT_SORT
+        template = _ydl_opts_template(quality)
+        opts = dict(template)
+        opts['postprocessors'] = [dict(pp) for pp in template['postprocessors']]
+        opts['sub_langs'] = list(template['sub_langs'])
+        opts['format_sort'] = list(template['format_sort'])
+        base = os.fspath(output_path)
+        opts['outtmpl'] = {
+            'default': os.path.join(base, 'video.%(ext)s'),
+            'thumbnail': os.path.join(base, 'thumbnail.%(ext)s'),
         }
         
-        # Explicitly set ffmpeg path if found
-        ffmpeg_path = shutil.which('ffmpeg')
-        if ffmpeg_path:
-            opts['ffmpeg_location'] = ffmpeg_path
-        
-        if settings.EMBED_SUBS:
-            opts['postprocessors'].append({
-                'key': 'FFmpegEmbedSubtitle',
-                'already_have_subtitle': False
-            })
-        
-        # Convert thumbnails to JPG format
-        opts['postprocessors'].append({
-            'key': 'FFmpegThumbnailsConvertor',
-            'format': 'jpg',
-            'when': 'before_dl'
-        })
-        
         if progress_hook:
             opts['progress_hooks'] = [progress_hook]
         
         return opts
     
     async def extract_info(self, url: str) -> Dict[str, Any]:
-        """Extract video/channel info without downloading"""
+        """Extract video/channel info without downloading; recent results are reused"""
+        cached = self._info_cache.get(url)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
         ytdlp_service = get_ytdlp_service()
         config = {'playlistend': settings.PLAYLIST_BATCH_SIZE}  # Limit extraction to batch size
-        return await ytdlp_service.extract_info(url, extra_config=config)
+        info = await ytdlp_service.extract_info(url, extra_config=config)
+        
+        self._info_cache.pop(url, None)
+        if len(self._info_cache) >= EXTRACT_INFO_CACHE_SIZE:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            self._info_cache.pop(next(iter(self._info_cache)))
+        self._info_cache[url] = (time.monotonic() + EXTRACT_INFO_CACHE_TTL, info)
+        return info
+    
+    def invalidate_extract_info(self, url: Optional[str] = None):
+        """Forget the cached extract_info result for url, or all of them"""
+        if url is None:
+            self._info_cache.clear()
+        else:
+            self._info_cache.pop(url, None)
     
     async def download_video(self, video_id: int, url: str, output_dir: Path, quality: Optional[str] = None) -> bool:
-        """Download a video"""
-        async with self._semaphore:
-            loop = asyncio.get_event_loop()
-            progress = DownloadProgress(video_id, loop, self._update_progress_db_async)
-            self.active_downloads[video_id] = progress
+        """Download a video; the caller has already marked its job as downloading"""
+        loop = asyncio.get_event_loop()
+        progress = DownloadProgress(video_id, loop, self._record_progress)
+        self.active_downloads[video_id] = progress
+        self.active_version += 1
+        
+        try:
+            # Create progress hook
+            def progress_hook(d):
+                # Runs on the yt-dlp thread, which task.cancel() cannot stop
+                if progress.cancelled:
+                    raise yt_dlp.utils.DownloadCancelled()
+                progress.update(d)
+            
+            # Download using centralized YTDLPService
+            ytdlp_service = get_ytdlp_service()
+            opts = self.get_ydl_opts(output_dir, quality, progress_hook)
             
+            await ytdlp_service.download_with_progress(
+                url=url,
+                output_path=output_dir,
+                progress_callback=progress_hook,
+                extra_config=opts
+            )
+            
+            # One directory read finds both the thumbnail and yt-dlp info.json
             try:
-                # Update status to downloading
-                await self.db.update(
-                    "job_queue",
-                    {"status": "downloading", "started_at": datetime.utcnow().isoformat()},
-                    "video_id = ?",
-                    (video_id,)
+                thumbnail_path, info_json_file = await asyncio.to_thread(
+                    self._scan_output_dir, output_dir, self._storage_root
                 )
-                
-                # Create progress hook
-                def progress_hook(d):
-                    progress.update(d)
-                
-                # Download using centralized YTDLPService
-                ytdlp_service = get_ytdlp_service()
-                opts = self.get_ydl_opts(output_dir, quality, progress_hook)
-                
-                await ytdlp_service.download_with_progress(
-                    url=url,
-                    output_path=output_dir,
-                    progress_callback=progress_hook,
-                    extra_config=opts
-                )
-                
-                # Process thumbnails after successful download
-                thumbnail_path = None
-                try:
-                    thumbnail_path = await self._find_existing_thumbnails(output_dir)
-                except Exception as e:
-                    # Don't fail the download if thumbnail processing fails
-                    print(f"Thumbnail processing error: {e}")
-                
-                # Create app metadata from yt-dlp info.json
-                try:
-                    await self._create_app_metadata(output_dir)
-                except Exception as e:
-                    # Don't fail the download if metadata creation fails
-                    print(f"App metadata creation error: {e}")
-                
-                # Extract actual quality from downloaded video info
-                actual_quality = None
+            except Exception as e:
+                logger.warning(f"Thumbnail processing error: {e}")
+                thumbnail_path, info_json_file = None, None
+            
+            # Read info.json once; app metadata and quality both come from it
+            info_data = None
+            if info_json_file:
                 try:
-                    info_file = output_dir / "video.info.json"
-                    if not info_file.exists():
-                        info_file = output_dir / "info.json"
-                    
-                    if info_file.exists():
-                        import json
-                        with open(info_file, 'r', encoding='utf-8') as f:
-                            info_data = json.load(f)
-                            actual_quality = QualityService.extract_quality_from_metadata(info_data)
+                    info_data = await asyncio.to_thread(_load_info_json, info_json_file)
                 except Exception as e:
-                    print(f"Quality extraction error: {e}")
-                
-                # Update video record
-                video_update = {
-                    "download_status": "completed",
-                    "file_path": str(output_dir.relative_to(settings.get_storage_path())),
-                    "updated_at": datetime.utcnow().isoformat()
-                }
-                
-                if actual_quality:
-                    video_update["quality"] = actual_quality
-                
-                if thumbnail_path:
-                    video_update["thumbnail_path"] = thumbnail_path
-                    video_update["thumbnail_generated"] = True
-                
-                await self.db.update(
-                    "videos",
-                    video_update,
-                    "id = ?",
-                    (video_id,)
-                )
-                
-                # Update queue
-                await self.db.update(
-                    "job_queue",
-                    {
-                        "status": "completed",
-                        "progress": 100.0,
-                        "completed_at": datetime.utcnow().isoformat()
-                    },
-                    "video_id = ?",
-                    (video_id,)
-                )
-                
-                return True
-                
+                    logger.warning(f"Error reading {info_json_file}: {e}")
+            else:
+                logger.info(f"No yt-dlp info.json found in {output_dir}")
+            
+            # Create app metadata; don't fail the download if it fails
+            await self._create_app_metadata(output_dir, info_data)
+            
+            # Extract actual quality from downloaded video info
+            actual_quality = None
+            try:
+                if info_data:
+                    actual_quality = QualityService.extract_quality_from_metadata(info_data)
             except Exception as e:
-                # Update error status
-                await self.db.update(
-                    "videos",
-                    {"download_status": "failed"},
-                    "id = ?",
-                    (video_id,)
-                )
-                
-                await self.db.update(
-                    "job_queue",
-                    {
-                        "status": "failed",
-                        "error_message": str(e)
-                    },
-                    "video_id = ?",
-                    (video_id,)
-                )
-                
-                return False
-                
-            finally:
-                del self.active_downloads[video_id]
-    
-    async def _update_progress_db_async(self, progress: DownloadProgress):
-        """Update download progress in database"""
-        try:
-            await self.db.update(
-                "job_queue",
-                {"progress": progress.progress},
-                "video_id = ?",
-                (progress.video_id,)
-            )
+                logger.warning(f"Quality extraction error: {e}")
+            
+            # Update video record
+            video_update = {
+                "download_status": "completed",
+                "file_path": str(output_dir.relative_to(self._storage_root))
+            }
+            
+            if actual_quality:
+                video_update["quality"] = actual_quality
+            
+            if thumbnail_path:
+                video_update["thumbnail_path"] = thumbnail_path
+                video_update["thumbnail_generated"] = True
+            
+            # Backfill fields that discovery's flat playlist entries leave out
+            backfill = []
+            if info_data:
+                for column in ('upload_date', 'description'):
+                    if info_data.get(column):
+                        backfill.append((
+                            "videos", {column: info_data[column]}, f"id = ? AND {column} IS NULL", (video_id,)
+                        ))
+            
+            # Update video record and queue together
+            await self.db.update_many(backfill + [
+                ("videos", video_update, "id = ?", (video_id,)),
+                ("job_queue", {
+                    "status": "completed",
+                    "progress": 100.0,
+                    "completed_at": utc_timestamp()
+                }, "video_id = ?", (video_id,)),
+            ])
+            
+            return True
+            
         except Exception as e:
-            # Don't let progress update errors crash the download
-            print(f"Progress update error: {e}")
+            # Update error status
+            await self.db.update_many([
+                ("videos", {"download_status": "failed"}, "id = ?", (video_id,)),
+                ("job_queue", {
+                    "status": "failed",
+                    "error_message": "Cancelled by user" if progress.cancelled else str(e)
+                }, "video_id = ?", (video_id,)),
+            ])
+            
+            return False
+            
+        finally:
+            self.active_downloads.pop(video_id, None)
+            self.active_version += 1
+    
+    def _record_progress(self, video_id: int, value: float):
+        """Publish a (throttled) progress update to subscribers"""
+        self.active_version += 1
+        progress = self.active_downloads.get(video_id)
+        if progress is None or not self._subscribers:
+            return
+        
+        event = (video_id, progress.status, value, progress.speed, progress.eta)
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                pass  # A slow subscriber misses intermediate ticks, not the next one
+    
+    def subscribe(self, maxsize: int = 256) -> asyncio.Queue:
+        """Get a queue of (video_id, status, progress, speed, eta) download progress events"""
+        queue = asyncio.Queue(maxsize)
+        self._subscribers.add(queue)
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Stop delivering progress events to a queue from subscribe()"""
+        self._subscribers.discard(queue)
     
     async def queue_download(self, video_id: int, priority: int = 0, quality: Optional[str] = None) -> int:
         """Add video download job to the unified job queue"""
@@ -264,11 +365,35 @@ class Downloader:
             "progress": 0.0
         })
         
-        # Start download task and track it
-        task = asyncio.create_task(self._process_job(queue_id))
-        self.active_tasks[queue_id] = task
-        
+        self.dispatch_download(queue_id, priority)
         return queue_id
+    
+    def dispatch_download(self, queue_id: int, priority: int = 0):
+        """Hand an already queued download job to the download workers"""
+        self._ensure_download_workers()
+        self._download_queue.put_nowait((-priority, next(self._download_seq), queue_id))
+    
+    def _ensure_download_workers(self):
+        """Start download workers on first use (needs a running loop)"""
+        self._download_workers = [w for w in self._download_workers if not w.done()]
+        while len(self._download_workers) < settings.MAX_CONCURRENT_DOWNLOADS:
+            self._download_workers.append(asyncio.create_task(self._download_worker()))
+    
+    async def _download_worker(self):
+        """Run queued download jobs one at a time, highest priority first"""
+        while True:
+            _, _, queue_id = await self._download_queue.get()
+            if queue_id in self.active_tasks:
+                # Dispatched again (e.g. paused and resumed) while already running
+                self._download_queue.task_done()
+                continue
+            # Run the job as its own task so cancel_download can cancel it
+            task = asyncio.create_task(self._process_job(queue_id))
+            self.active_tasks[queue_id] = task
+            try:
+                await asyncio.wait((task,))
+            finally:
+                self._download_queue.task_done()
         
     async def queue_subscription_discovery(self, subscription_id: int, priority: int = 0) -> int:
         """Queue a subscription discovery job"""
@@ -304,10 +429,15 @@ class Downloader:
     
     async def _process_job(self, queue_id: int):
         """Process a queued job (download, subscription discovery, etc.)"""
-        # Get job info
-        job = await self.db.execute_one(
-            "SELECT * FROM job_queue WHERE id = ? AND status IN ('queued', 'downloading', 'processing')",
-            (queue_id,)
+        # Claim the job and mark it running in one statement. Only a queued job can be
+        # claimed, so a stale or repeated dispatch of the same id is skipped here
+        job = await self.db.execute_returning(
+            """UPDATE job_queue
+               SET status = CASE job_type WHEN 'download' THEN 'downloading' ELSE 'processing' END,
+                   started_at = ?
+               WHERE id = ? AND status = 'queued'
+               RETURNING *""",
+            (utc_timestamp(), queue_id)
         )
         
         if not job:
@@ -331,21 +461,20 @@ class Downloader:
                 {
                     "status": "failed",
                     "error_message": str(e),
-                    "completed_at": datetime.utcnow().isoformat()
+                    "completed_at": utc_timestamp()
                 },
                 "id = ?",
                 (queue_id,)
             )
         finally:
-            # Clean up task tracking
-            if queue_id in self.active_tasks:
-                del self.active_tasks[queue_id]
+            # Clean up task tracking; cancel_download may have removed it already
+            self.active_tasks.pop(queue_id, None)
     
     async def _process_download_job(self, job: Dict[str, Any]):
         """Process a download job"""
         video_id = job['video_id']
         
-        # Get video and download queue info
+        # Get video info
         video = await self.db.execute_one(
             """SELECT v.*, c.youtube_id as channel_youtube_id, c.name as channel_name
                FROM videos v
@@ -363,10 +492,9 @@ class Downloader:
             video['channel_name']
         )
         
-        safe_title = "".join(c for c in video['title'] if c.isalnum() or c in (' ', '-', '_')).strip()
-        safe_title = safe_title.replace(' ', '_')[:100]
+        safe_title = video['title'].translate(_TITLE_CHARS).strip().replace(' ', '_')[:100]
         video_dir = channel_path / f"{video['youtube_id']}_{safe_title}"
-        video_dir.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(video_dir.mkdir, parents=True, exist_ok=True)
         
         # Download
         url = f"https://www.youtube.com/watch?v={video['youtube_id']}"
@@ -377,17 +505,6 @@ class Downloader:
         subscription_id = job['subscription_id']
         queue_id = job['id']
         
-        # Update status to processing
-        await self.db.update(
-            "job_queue",
-            {
-                "status": "processing",
-                "started_at": datetime.utcnow().isoformat()
-            },
-            "id = ?",
-            (queue_id,)
-        )
-        
         # Get subscription details
         subscription = await self.db.execute_one(
             """SELECT s.*, c.youtube_id as channel_youtube_id 
@@ -405,21 +522,44 @@ class Downloader:
         # Import the classification function
         from app.api.endpoints.videos import classify_video_type
         
-        # Extract video list using ytdlp
+        # Get subscription preferences
+        desired_count = subscription.get('latest_n_videos', 20)
+        subscription_content_types = Database.json_decode(subscription.get('content_types', '["video"]'))
+        
+        # Extract video list using ytdlp. Flat extraction lists playlist entries
+        # without resolving each video, so it costs one request per page, not per video
         ytdlp_service = get_ytdlp_service()
+        flat_config = {'extract_flat': 'in_playlist', 'playlistend': desired_count * 2}
         
         try:
-            info = await ytdlp_service.extract_info(subscription['source_url'])
+            info = await ytdlp_service.extract_info(subscription['source_url'], extra_config=flat_config)
+            
+            # Handle different info structures
+            entries = []
+            if info.get('_type') == 'playlist' or 'entries' in info:
+                entries = info.get('entries', [])
+            elif info.get('id'):  # Single video
+                entries = [info]
+            
+            # A channel root lists its tabs (Videos, Shorts, Live) as nested playlists.
+            # Interleave them, newest first in each, so every tab gets classified
+            groups = 1
+            if any(entry and entry.get('ie_key') == 'YoutubeTab' for entry in entries):
+                tabs = []
+                others = []
+                for entry in entries:
+                    if entry and entry.get('ie_key') == 'YoutubeTab':
+                        tab = await ytdlp_service.extract_info(entry['url'], extra_config=flat_config)
+                        tabs.append(tab.get('entries') or [])
+                    else:
+                        others.append(entry)
+                if others:
+                    tabs.append(others)
+                groups = max(len(tabs), 1)
+                entries = [entry for row in itertools.zip_longest(*tabs) for entry in row if entry]
         except Exception as e:
             raise Exception(f"Failed to extract info from {subscription['source_url']}: {e}")
             
-        # Handle different info structures
-        entries = []
-        if info.get('_type') == 'playlist' or 'entries' in info:
-            entries = info.get('entries', [])
-        elif info.get('id'):  # Single video
-            entries = [info]
-            
         if not entries:
             logger.warning(f"No entries found for subscription {subscription_id}")
             await self.db.update(
@@ -429,7 +569,7 @@ class Downloader:
                     "progress": 100.0,
                     "videos_found": 0,
                     "videos_processed": 0,
-                    "completed_at": datetime.utcnow().isoformat()
+                    "completed_at": utc_timestamp()
                 },
                 "id = ?",
                 (queue_id,)
@@ -447,44 +587,53 @@ class Downloader:
             (queue_id,)
         )
         
-        # Get subscription preferences
-        desired_count = subscription.get('latest_n_videos', 20)
-        subscription_content_types = Database.json_decode(subscription.get('content_types', '["video"]'))
-        
+        # Look up which candidates we already have in one query
+        candidates = entries[:desired_count * 2 * groups]  # Process more to find matches, per tab
+        candidate_ids = [entry['id'] for entry in candidates if entry and entry.get('id')]
+        existing_ids = set()
+        if candidate_ids:
+            placeholders = ','.join('?' * len(candidate_ids))
+            rows = await self.db.execute(
+                f"SELECT youtube_id FROM videos WHERE youtube_id IN ({placeholders})",
+                tuple(candidate_ids)
+            )
+            existing_ids = {row['youtube_id'] for row in rows}
+
         # Filter and process videos
         matched_videos = []
-        for i, entry in enumerate(entries[:desired_count * 2]):  # Process more to find matches
+        last_pct = -10.0
+        for i, entry in enumerate(candidates):
             if not entry or not entry.get('id'):
                 continue
                 
             video_id = entry.get('id')
+            # Skip known videos before classifying; on mature channels that is most of them
+            if video_id in existing_ids:
+                continue
+            
             video_type = classify_video_type(entry)
             
             # Check if this video type is wanted
             if video_type not in subscription_content_types:
                 continue
-                
-            # Check if video already exists
-            existing = await self.db.execute_one(
-                "SELECT id FROM videos WHERE youtube_id = ?",
-                (video_id,)
-            )
             
-            if not existing:
-                matched_videos.append({
-                    'entry': entry,
-                    'video_id': video_id,
-                    'video_type': video_type
-                })
-                
-            # Update progress
+            matched_videos.append({
+                'entry': entry,
+                'video_id': video_id,
+                'video_type': video_type
+            })
+            existing_ids.add(video_id)  # Playlists can list the same video twice
+            
+            # Update progress in steps rather than once per entry
             progress_pct = 10.0 + (i / len(entries)) * 40.0
-            await self.db.update(
-                "job_queue",
-                {"progress": progress_pct},
-                "id = ?",
-                (queue_id,)
-            )
+            if progress_pct - last_pct >= 5.0:
+                await self.db.update(
+                    "job_queue",
+                    {"progress": progress_pct},
+                    "id = ?",
+                    (queue_id,)
+                )
+                last_pct = progress_pct
             
             if len(matched_videos) >= desired_count:
                 break
@@ -494,65 +643,73 @@ class Downloader:
         # Process matched videos
         new_videos = []
         errors = []
+        video_rows = []
         
         for i, video_data in enumerate(matched_videos):
             entry = video_data['entry']
             video_id = video_data['video_id']
             video_type = video_data['video_type']
             
-            try:
-                # Create video record
-                video_db_id = await self.db.insert("videos", {
-                    "youtube_id": video_id,
-                    "channel_id": subscription['channel_id'],
-                    "title": entry.get('title', 'Unknown Title'),
-                    "description": entry.get('description'),
-                    "duration": entry.get('duration'),
-                    "upload_date": entry.get('upload_date'),
-                    "video_type": video_type,
-                    "download_status": "pending",
-                    "created_at": datetime.utcnow().isoformat(),
-                    "updated_at": datetime.utcnow().isoformat()
-                })
-                
-                # Auto-queue for download if enabled
-                if subscription.get('auto_download', True):
-                    try:
-                        await self.queue_download(
-                            video_db_id,
-                            priority=1,  # Subscription videos get priority 1
-                            quality=subscription.get('quality_preference', '720p')
-                        )
-                    except Exception as e:
-                        errors.append(f"Failed to queue video {video_id}: {str(e)}")
-                        
-                new_videos.append({
-                    "youtube_id": video_id,
-                    "title": entry.get('title')
-                })
-                
-                # Update progress
-                progress_pct = 50.0 + (i / len(matched_videos)) * 50.0
+            # Use what the flat entry has; a missing upload_date is filled in
+            # from info.json when the video is downloaded or its metadata extracted
+            video_rows.append({
+                "youtube_id": video_id,
+                "channel_id": subscription['channel_id'],
+                "title": entry.get('title', 'Unknown Title'),
+                "description": entry.get('description'),
+                "duration": entry.get('duration'),
+                "upload_date": _entry_upload_date(entry),
+                "video_type": video_type,
+                "download_status": "pending"
+            })
+            new_videos.append({
+                "youtube_id": video_id,
+                "title": entry.get('title')
+            })
+            
+            # Update progress in steps rather than once per video
+            progress_pct = 50.0 + (i / len(matched_videos)) * 50.0
+            if progress_pct - last_pct >= 5.0:
                 await self.db.update(
                     "job_queue",
-                    {
-                        "progress": progress_pct,
-                        "videos_processed": len(new_videos)
-                    },
+                    {"progress": progress_pct},
                     "id = ?",
                     (queue_id,)
                 )
-                
-            except Exception as e:
-                error_msg = f"Failed to add video {video_id}: {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg)
+                last_pct = progress_pct
+        
+        # Create all video records in one transaction; created_at/updated_at come from the schema defaults
+        try:
+            video_db_ids = await self.db.insert_many("videos", video_rows, "youtube_id")
+            # Videos added elsewhere since the existing-id check are not new here
+            new_videos = [video for video in new_videos if video['youtube_id'] in video_db_ids]
+        except Exception as e:
+            error_msg = f"Failed to add {len(video_rows)} videos: {str(e)}"
+            errors.append(error_msg)
+            logger.error(error_msg)
+            new_videos = []
+            video_db_ids = {}
+        
+        # Auto-queue for download if enabled
+        if new_videos and subscription.get('auto_download', True):
+            quality = subscription.get('quality_preference', '720p')
+            results = await asyncio.gather(
+                *(self.queue_download(
+                    video_db_ids[video['youtube_id']],
+                    priority=1,  # Subscription videos get priority 1
+                    quality=quality
+                ) for video in new_videos),
+                return_exceptions=True
+            )
+            for video, result in zip(new_videos, results):
+                if isinstance(result, Exception):
+                    errors.append(f"Failed to queue video {video['youtube_id']}: {str(result)}")
                 
         # Update subscription stats
         await self.db.update(
             "subscriptions",
             {
-                "last_check": datetime.utcnow().isoformat(),
+                "last_check": utc_timestamp(),
                 "new_videos_count": len(new_videos)
             },
             "id = ?",
@@ -576,7 +733,7 @@ class Downloader:
                 "videos_found": len(entries),
                 "videos_processed": len(new_videos),
                 "result_data": Database.json_encode(result_data),
-                "completed_at": datetime.utcnow().isoformat()
+                "completed_at": utc_timestamp()
             },
             "id = ?",
             (queue_id,)
@@ -589,17 +746,6 @@ class Downloader:
         video_url = job['video_url']
         queue_id = job['id']
         
-        # Update status to processing
-        await self.db.update(
-            "job_queue",
-            {
-                "status": "processing",
-                "started_at": datetime.utcnow().isoformat()
-            },
-            "id = ?",
-            (queue_id,)
-        )
-        
         logger.info(f"Processing video metadata extraction for {video_url}")
         
         # Extract metadata using ytdlp
@@ -608,10 +754,19 @@ class Downloader:
         try:
             info = await ytdlp_service.extract_info(video_url)
             
+            # Fill in what discovery could not get from flat playlist entries
+            if info.get('id') and info.get('upload_date'):
+                await self.db.update(
+                    "videos",
+                    {"upload_date": info['upload_date']},
+                    "youtube_id = ? AND upload_date IS NULL",
+                    (info['id'],)
+                )
+            
             # Store results and mark completed
             result_data = {
-                "video_info": info,
-                "extracted_at": datetime.utcnow().isoformat()
+                "video_info": {field: info.get(field) for field in _METADATA_RESULT_FIELDS},
+                "extracted_at": utc_timestamp()
             }
             
             await self.db.update(
@@ -622,7 +777,7 @@ class Downloader:
                     "videos_found": 1,
                     "videos_processed": 1,
                     "result_data": Database.json_encode(result_data),
-                    "completed_at": datetime.utcnow().isoformat()
+                    "completed_at": utc_timestamp()
                 },
                 "id = ?",
                 (queue_id,)
@@ -631,75 +786,88 @@ class Downloader:
         except Exception as e:
             raise Exception(f"Failed to extract metadata from {video_url}: {e}")
     
-    def get_active_downloads(self) -> Dict[int, DownloadProgress]:
-        """Get current active downloads and jobs"""
-        return self.active_downloads.copy() 
+    def get_active_downloads(self) -> Mapping[int, DownloadProgress]:
+        """Get a read-only live view of current active downloads and jobs"""
+        return MappingProxyType(self.active_downloads)
+    
+    def get_active_downloads_since(self, version: Optional[int]) -> Tuple[int, Optional[Mapping[int, DownloadProgress]]]:
+        """Get (current version, active downloads), or None for the downloads if nothing changed since ``version``"""
+        if version == self.active_version:
+            return version, None
+        return self.active_version, MappingProxyType(self.active_downloads)
 
-    async def _find_existing_thumbnails(self, output_dir: Path) -> Optional[str]:
-        """Find existing yt-dlp thumbnail files and return relative path from storage root."""
-        # Check JPG first since we convert to JPG
-        for ext in ('.jpg', '.jpeg', '.png', '.webp'):
-            thumbnail_file = output_dir / f'thumbnail{ext}'
-            if thumbnail_file.exists():
-                # Return relative path from storage root
-                return str(thumbnail_file.relative_to(settings.get_storage_path()))
-        return None
+    @staticmethod
+    def _scan_output_dir(output_dir: Path, storage_root: Path) -> Tuple[Optional[str], Optional[Path]]:
+        """Pick the preferred thumbnail (relative to storage root) and info.json from a single os.scandir"""
+        base = os.fspath(output_dir)
+        with os.scandir(base) as entries:
+            names = {entry.name for entry in entries}
+        
+        thumbnail_path = None
+        for name in _THUMBNAIL_NAMES:
+            if name in names:
+                thumbnail_path = os.path.relpath(os.path.join(base, name), storage_root)
+                break
+        
+        # Our outtmpl names it video.info.json; older downloads were named
+        # after the title, or plain info.json
+        info_json_name = 'video.info.json' if 'video.info.json' in names else None
+        if not info_json_name:
+            info_json_name = next((name for name in names if name.endswith('.info.json')), None)
+        if not info_json_name and 'info.json' in names:
+            info_json_name = 'info.json'
+        info_json_file = output_dir / info_json_name if info_json_name else None
+        return thumbnail_path, info_json_file
     
-    async def _create_app_metadata(self, output_dir: Path) -> bool:
-        """Create app metadata file from yt-dlp info.json"""
+    async def _create_app_metadata(self, output_dir: Path, ytdlp_info: Optional[Dict[str, Any]]) -> bool:
+        """Create app metadata file from parsed yt-dlp info.json"""
         try:
-            # Find yt-dlp info.json file
-            info_json_file = None
-            for file_path in output_dir.iterdir():
-                if file_path.name.endswith('.info.json'):
-                    info_json_file = file_path
-                    break
-            
-            if not info_json_file or not info_json_file.exists():
-                print(f"No yt-dlp info.json found in {output_dir}")
+            if not ytdlp_info:
                 return False
             
-            # Load yt-dlp metadata
-            with open(info_json_file, 'r', encoding='utf-8') as f:
-                ytdlp_info = json.load(f)
-            
-            # Parse into app metadata format
-            storage_root = settings.get_storage_path()
-            metadata = MetadataManager.parse_from_ytdlp(ytdlp_info, output_dir, storage_root)
-            
-            # Save app metadata
-            success = MetadataManager.save_metadata(metadata, output_dir)
+            # Parse into app metadata format and save it off the event loop,
+            # so concurrent downloads keep reporting progress meanwhile
+            metadata = await asyncio.to_thread(
+                MetadataManager.parse_from_ytdlp, ytdlp_info, output_dir, self._storage_root
+            )
+            success = await asyncio.to_thread(MetadataManager.save_metadata, metadata, output_dir)
             if success:
-                print(f"Created app metadata for {output_dir.name}")
+                logger.info(f"Created app metadata for {output_dir.name}")
             
             return success
             
         except Exception as e:
-            print(f"Error creating app metadata for {output_dir}: {str(e)}")
+            logger.warning(f"Error creating app metadata for {output_dir}: {str(e)}")
             return False
 
-    async def cancel_download(self, video_id: int) -> bool:
-        """Cancel an active download"""
-        if video_id in self.active_tasks:
-            task = self.active_tasks[video_id]
+    async def cancel_download(self, video_id: int, queue_id: int) -> bool:
+        """Cancel a running download job and wait until it has actually stopped
+
+        Jobs still waiting in the queue have no task to stop. Returns False if the
+        job finished before the cancel took effect.
+        """
+        task = self.active_tasks.get(queue_id)
+        if task is None or task.done():
+            return False
+        
+        progress = self.active_downloads.get(video_id)
+        if progress is not None:
+            # yt-dlp is running on a worker thread; cancelling the task would only stop
+            # the wait for it. Flag the download so its progress hook aborts the transfer,
+            # and download_video records the failure once the thread has returned
+            progress.cancelled = True
+        else:
             task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                del self.active_tasks[video_id]
-                if video_id in self.active_downloads:
-                    del self.active_downloads[video_id]
-                await self.db.update(
-                    "job_queue",
-                    {"status": "failed", "error_message": "Cancelled by user"},
-                    "video_id = ?",
-                    (video_id,)
-                )
-                await self.db.update(
-                    "videos",
-                    {"download_status": "failed"},
-                    "id = ?",
-                    (video_id,)
-                )
-                return True
-        return False
\ No newline at end of file
+        await asyncio.wait((task,))
+        if self.active_tasks.get(queue_id) is task:
+            del self.active_tasks[queue_id]  # A task cancelled before it ran never reaches its finally
+        
+        job = await self.db.execute_one("SELECT status FROM job_queue WHERE id = ?", (queue_id,))
+        if job is None or job['status'] == 'completed':
+            return False
+        if job['status'] != 'failed':
+            await self.db.update_many([
+                ("job_queue", {"status": "failed", "error_message": "Cancelled by user"}, "id = ?", (queue_id,)),
+                ("videos", {"download_status": "failed"}, "id = ?", (video_id,)),
+            ])
+        return True
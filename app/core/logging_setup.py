@@ -81,17 +81,16 @@ def configure_module_loggers() -> None:
     logging.getLogger('watchfiles.main').setLevel(logging.WARNING)
 
 
+_SIZE_UNITS = {'KB': 1024, 'MB': 1024 * 1024, 'GB': 1024 * 1024 * 1024}
+
+
 def _parse_size(size_str: str) -> int:
     """Parse size string like '10MB' to bytes"""
     size_str = size_str.upper()
-    if size_str.endswith('KB'):
-        return int(size_str[:-2]) * 1024
-    elif size_str.endswith('MB'):
-        return int(size_str[:-2]) * 1024 * 1024
-    elif size_str.endswith('GB'):
-        return int(size_str[:-2]) * 1024 * 1024 * 1024
-    else:
-        return int(size_str)
+    unit = _SIZE_UNITS.get(size_str[-2:])
+    if unit:
+        return int(size_str[:-2]) * unit
+    return int(size_str)
 
 
 def get_ytdlp_logger() -> logging.Logger:
@@ -102,17 +101,21 @@ def get_ytdlp_logger() -> logging.Logger:
 def log_ytdlp_operation(operation: str, url: str, extra_data: Dict[str, Any] = None) -> None:
     """Helper function to log yt-dlp operations with consistent format"""
     logger = get_ytdlp_logger()
+    if not logger.isEnabledFor(logging.INFO):
+        return
     
     # Sanitize URL for logging (remove tokens, etc.)
     sanitized_url = _sanitize_url_for_logging(url)
     
-    base_msg = f"YT-DLP {operation} | URL: {sanitized_url}"
-    
     if extra_data:
-        details = " | ".join([f"{k}: {v}" for k, v in extra_data.items()])
-        base_msg += f" | {details}"
-    
-    logger.info(base_msg)
+        details = " | ".join(f"{k}: {v}" for k, v in extra_data.items())
+        logger.info("YT-DLP %s | URL: %s | %s", operation, sanitized_url, details)
+    else:
+        logger.info("YT-DLP %s | URL: %s", operation, sanitized_url)
+
+
+# Query parameters that identify content and carry no credentials
+_SAFE_URL_PARAMS = frozenset({'v', 'list', 'channel', 'user', 'c'})
 
 
 def _sanitize_url_for_logging(url: str) -> str:
@@ -121,12 +124,10 @@ def _sanitize_url_for_logging(url: str) -> str:
     if '?' in url:
         base_url, params = url.split('?', 1)
         # Keep only safe parameters for logging
-        safe_params = []
-        for param in params.split('&'):
-            if '=' in param:
-                key, _ = param.split('=', 1)
-                if key.lower() in ['v', 'list', 'channel', 'user', 'c']:
-                    safe_params.append(param)
+        safe_params = [
+            param for param in params.split('&')
+            if '=' in param and param.partition('=')[0].lower() in _SAFE_URL_PARAMS
+        ]
         
         if safe_params:
             url = f"{base_url}?{'&'.join(safe_params)}"
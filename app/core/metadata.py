@@ -2,19 +2,29 @@
 Video metadata handling and parsing
 """
 
-import json
 import logging
+import os
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import Dict, Any, Optional, List, Literal
-from datetime import datetime
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Literal, Tuple
+from datetime import datetime, timezone
+import orjson
 
 logger = logging.getLogger(__name__)
 
+
+def _utc_now_z() -> str:
+    """Current UTC time as ISO 8601 with a 'Z' suffix, the format app.meta.json uses"""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + 'Z'
+
+
 # Video type enumeration
 VideoType = Literal['video', 'short', 'live']
 
-@dataclass
+_LIVE_STATUSES = frozenset({'is_live', 'is_upcoming'})
+
+
+@dataclass(slots=True)
 class VideoMetadata:
     """Structured video metadata"""
     app: Dict[str, Any]
@@ -24,7 +34,14 @@ class VideoMetadata:
     content: Dict[str, Any]
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Shallow: the sections are shared with this instance, not copied
+        return {
+            'app': self.app,
+            'video': self.video,
+            'channel': self.channel,
+            'technical': self.technical,
+            'content': self.content
+        }
 
 
 def classify_video_type(ytdlp_info: Dict[str, Any]) -> VideoType:
@@ -38,26 +55,17 @@ def classify_video_type(ytdlp_info: Dict[str, Any]) -> VideoType:
         VideoType: 'live', 'short', or 'video'
     """
     # Live content takes highest priority
-    if ytdlp_info.get('is_live'):
-        return 'live'
-    
-    live_status = ytdlp_info.get('live_status', '')
-    if live_status in ('is_live', 'is_upcoming'):
+    if ytdlp_info.get('is_live') or ytdlp_info.get('live_status') in _LIVE_STATUSES:
         return 'live'
     
-    # Check for shorts based on aspect ratio
-    width = ytdlp_info.get('width', 0)
-    height = ytdlp_info.get('height', 0)
-    
-    if height > 0 and width > 0:
-        aspect_ratio = width / height
-        # Vertical videos (aspect ratio < 1.0) are likely shorts
-        if aspect_ratio < 1.0:
-            return 'short'
+    # Flat playlist entries have no dimensions, but shorts are linked as /shorts/<id>
+    if '/shorts/' in (ytdlp_info.get('url') or ''):
+        return 'short'
     
-    # Also check duration as secondary indicator for shorts
-    duration = ytdlp_info.get('duration', 0)
-    if duration and duration <= 60 and width and height and width < height:
+    # Vertical videos are likely shorts; yt-dlp may report missing dimensions as None
+    width = ytdlp_info.get('width') or 0
+    height = ytdlp_info.get('height') or 0
+    if width and height and width < height:
         return 'short'
     
     # Default to regular video
@@ -68,6 +76,8 @@ class MetadataManager:
     """Manages video metadata creation and parsing"""
     
     APP_METADATA_VERSION = "1.0"
+    VIDEO_EXTENSIONS = frozenset({'.mp4', '.mkv', '.webm', '.avi', '.mov', '.flv', '.m4v'})
+    THUMBNAIL_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.webp'})
     
     @classmethod
     def parse_from_ytdlp(cls, ytdlp_info: Dict[str, Any], video_dir: Path, 
@@ -76,9 +86,9 @@ class MetadataManager:
         Parse yt-dlp info.json into stable app metadata format
         """
         # App-specific metadata
-        now = datetime.utcnow().isoformat() + 'Z'
-        video_file = cls._find_video_file(video_dir)
-        thumbnail_file = cls._find_thumbnail_file(video_dir)
+        now = _utc_now_z()
+        video_file, video_size, thumbnail_file = cls._scan_outputs(video_dir)
+        video_type = classify_video_type(ytdlp_info)
         
         app_metadata = {
             'version': cls.APP_METADATA_VERSION,
@@ -86,10 +96,10 @@ class MetadataManager:
             'updated_at': now,
             'download_status': 'completed',
             'file_path': str(video_file.relative_to(storage_root)) if video_file else None,
-            'file_size': video_file.stat().st_size if video_file and video_file.exists() else None,
+            'file_size': video_size,
             'thumbnail_path': str(thumbnail_file.relative_to(storage_root)) if thumbnail_file else None,
             'source': 'yt-dlp',
-            'video_type': classify_video_type(ytdlp_info)  # Add classification
+            'video_type': video_type  # Add classification
         }
         
         # Core video metadata
@@ -107,7 +117,7 @@ class MetadataManager:
             'comment_count': ytdlp_info.get('comment_count'),
             'webpage_url': ytdlp_info.get('webpage_url', ''),
             'display_id': ytdlp_info.get('display_id', ''),
-            'video_type': classify_video_type(ytdlp_info)  # Add to video metadata too
+            'video_type': video_type  # Add to video metadata too
         }
         
         # Channel metadata
@@ -173,8 +183,10 @@ class MetadataManager:
         """Save app metadata to video directory"""
         try:
             metadata_file = video_dir / 'app.meta.json'
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata.to_dict(), f, indent=2, ensure_ascii=False)
+            metadata_file.write_bytes(
+                # orjson serializes the dataclass natively, without an asdict() deep copy
+                orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
             logger.info(f"Saved app metadata to {metadata_file}")
             return True
         except Exception as e:
@@ -189,8 +201,7 @@ class MetadataManager:
             if not metadata_file.exists():
                 return None
                 
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = orjson.loads(metadata_file.read_bytes())
             
             return VideoMetadata(
                 app=data.get('app', {}),
@@ -207,39 +218,41 @@ class MetadataManager:
     def update_app_metadata(cls, video_dir: Path, **updates) -> bool:
         """Update specific app metadata fields"""
         try:
-            metadata = cls.load_metadata(video_dir)
-            if not metadata:
+            metadata_file = video_dir / 'app.meta.json'
+            if not metadata_file.exists():
                 logger.warning(f"No metadata file found in {video_dir}")
                 return False
             
-            # Update app metadata fields
-            metadata.app.update(updates)
-            metadata.app['updated_at'] = datetime.utcnow().isoformat() + 'Z'
+            # Patch the app section of the raw document; the other sections are
+            # written back untouched without rebuilding a VideoMetadata
+            data = orjson.loads(metadata_file.read_bytes())
+            app = data.setdefault('app', {})
+            app.update(updates)
+            app['updated_at'] = _utc_now_z()
             
-            return cls.save_metadata(metadata, video_dir)
+            metadata_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            return True
         except Exception as e:
             logger.error(f"Failed to update metadata in {video_dir}: {str(e)}")
             return False
     
     @classmethod
-    def _find_video_file(cls, video_dir: Path) -> Optional[Path]:
-        """Find the main video file in directory"""
-        video_extensions = {'.mp4', '.mkv', '.webm', '.avi', '.mov', '.flv', '.m4v'}
+    def _scan_outputs(cls, video_dir: Path) -> Tuple[Optional[Path], Optional[int], Optional[Path]]:
+        """Find the main video file, its size, and the thumbnail file in one directory pass"""
+        video_file = video_size = thumbnail_file = None
         
-        for file_path in video_dir.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in video_extensions:
-                return file_path
-        return None
-    
-    @classmethod
-    def _find_thumbnail_file(cls, video_dir: Path) -> Optional[Path]:
-        """Find thumbnail file in directory"""
-        thumbnail_extensions = {'.jpg', '.jpeg', '.png', '.webp'}
+        with os.scandir(video_dir) as entries:
+            for entry in entries:
+                ext = os.path.splitext(entry.name)[1].lower()
+                if video_file is None and ext in cls.VIDEO_EXTENSIONS and entry.is_file():
+                    video_file = Path(entry.path)
+                    video_size = entry.stat().st_size
+                elif thumbnail_file is None and ext in cls.THUMBNAIL_EXTENSIONS and entry.is_file():
+                    thumbnail_file = Path(entry.path)
+                if video_file is not None and thumbnail_file is not None:
+                    break
         
-        for file_path in video_dir.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in thumbnail_extensions:
-                return file_path
-        return None
+        return video_file, video_size, thumbnail_file
     
     @classmethod
     def _extract_subtitle_languages(cls, subtitles_dict: Dict[str, Any]) -> list:
@@ -1,6 +1,7 @@
 """
 Quality management and mapping for YouHoard
 """
+import time
 from typing import Optional, Dict, Any
 from app.core.database import Database
 
@@ -19,11 +20,22 @@ class QualityService:
     }
     
     DEFAULT_QUALITY = "1080p"
+    _DEFAULT_FORMAT = QUALITY_FORMATS[DEFAULT_QUALITY]
+    
+    # The global default_quality setting is only changed by editing the settings
+    # table directly, so it is cached as (expires_at, value): a new value takes
+    # effect for subscription-less lookups within GLOBAL_QUALITY_TTL seconds
+    GLOBAL_QUALITY_TTL = 60.0  # seconds
+    _global_quality_cache = (0.0, None)
+    
+    # Checked in order, so the first matching entry wins
+    _HEIGHT_LABELS = ((1080, "1080p"), (720, "720p"), (480, "480p"), (360, "360p"))
+    _FORMAT_NOTE_LABELS = (("hd", "1080p"), ("1080", "1080p"), ("720", "720p"), ("480", "480p"), ("360", "360p"))
     
     @classmethod
     def get_format_selector(cls, quality: str) -> str:
         """Convert quality preference to yt-dlp format selector"""
-        return cls.QUALITY_FORMATS.get(quality, cls.QUALITY_FORMATS[cls.DEFAULT_QUALITY])
+        return cls.QUALITY_FORMATS.get(quality, cls._DEFAULT_FORMAT)
     
     @classmethod
     def validate_quality(cls, quality: str) -> bool:
@@ -50,24 +62,28 @@ class QualityService:
         if video_quality and cls.validate_quality(video_quality):
             return video_quality
         
-        # 2. Subscription quality preference
-        if subscription_id:
-            subscription = await db.execute_one(
-                "SELECT quality_preference FROM subscriptions WHERE id = ?",
+        # 2 and 3 in one round trip: subscription preference, then global preference.
+        # Without a subscription a recently read global preference is reused instead
+        now = time.monotonic()
+        expires_at, global_quality = cls._global_quality_cache
+        if subscription_id or now >= expires_at:
+            rows = await db.execute(
+                """SELECT 'subscription' AS source, quality_preference AS quality
+                   FROM subscriptions WHERE id = ?
+                   UNION ALL
+                   SELECT 'global', value FROM settings WHERE key = 'default_quality'""",
                 (subscription_id,)
             )
-            if subscription and subscription['quality_preference']:
-                if cls.validate_quality(subscription['quality_preference']):
-                    return subscription['quality_preference']
+            preferences = {row['source']: row['quality'] for row in rows}
+            global_quality = preferences.get('global')
+            cls._global_quality_cache = (now + cls.GLOBAL_QUALITY_TTL, global_quality)
+            
+            subscription_quality = preferences.get('subscription')
+            if subscription_quality and cls.validate_quality(subscription_quality):
+                return subscription_quality
         
-        # 3. Global application quality preference
-        global_setting = await db.execute_one(
-            "SELECT value FROM settings WHERE key = ?",
-            ("default_quality",)
-        )
-        if global_setting and global_setting['value']:
-            if cls.validate_quality(global_setting['value']):
-                return global_setting['value']
+        if global_quality and cls.validate_quality(global_quality):
+            return global_quality
         
         # 4. System default quality (fallback)
         return cls.DEFAULT_QUALITY
@@ -78,26 +94,15 @@ class QualityService:
         # Try to get resolution info
         height = metadata.get('height')
         if height:
-            if height >= 1080:
-                return "1080p"
-            elif height >= 720:
-                return "720p"
-            elif height >= 480:
-                return "480p"
-            elif height >= 360:
-                return "360p"
-            else:
-                return f"{height}p"
+            for min_height, label in cls._HEIGHT_LABELS:
+                if height >= min_height:
+                    return label
+            return f"{height}p"
         
         # Fallback to format info
-        format_note = metadata.get('format_note', '').lower()
-        if 'hd' in format_note or '1080' in format_note:
-            return "1080p"
-        elif '720' in format_note:
-            return "720p"
-        elif '480' in format_note:
-            return "480p"
-        elif '360' in format_note:
-            return "360p"
+        format_note = (metadata.get('format_note') or '').lower()
+        for marker, label in cls._FORMAT_NOTE_LABELS:
+            if marker in format_note:
+                return label
         
-        return None 
\ No newline at end of file
+        return None
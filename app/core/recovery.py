@@ -3,13 +3,14 @@ Auto-recovery and migration system for YouHoard
 Scans storage directory and rebuilds database from existing video files
 """
 import json
+import os
 import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 import logging
 
-from app.core.database import Database
+from app.core.database import Database, utc_timestamp
 from app.core.config import settings
 from app.core.metadata import MetadataManager, classify_video_type
 
@@ -308,11 +309,15 @@ class RecoveryManager:
         """
         Find the main video file in a video directory
         """
-        video_extensions = {'.mp4', '.mkv', '.webm', '.avi', '.mov', '.flv', '.m4v'}
-        
-        for file_path in video_dir.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in video_extensions:
-                return file_path
+        # Match on the entry name and only build a Path for the winner
+        with os.scandir(video_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                dot = name.rfind('.')
+                if dot < 0:
+                    continue
+                if name[dot:].lower() in MetadataManager.VIDEO_EXTENSIONS and entry.is_file():
+                    return Path(entry.path)
         
         return None
     
@@ -320,20 +325,23 @@ class RecoveryManager:
         """
         Find thumbnail file in video directory
         """
-        thumbnail_extensions = {'.jpg', '.jpeg', '.png', '.webp'}
-        
-        for file_path in video_dir.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in thumbnail_extensions:
-                # Prioritize files with "thumbnail" in the name
-                if 'thumbnail' in file_path.name.lower():
-                    return file_path
-        
-        # If no explicit thumbnail file, look for any image file
-        for file_path in video_dir.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in thumbnail_extensions:
-                return file_path
-        
-        return None
+        fallback = None
+        
+        with os.scandir(video_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                dot = name.rfind('.')
+                if dot < 0:
+                    continue
+                if name[dot:].lower() in MetadataManager.THUMBNAIL_EXTENSIONS and entry.is_file():
+                    # Prioritize files with "thumbnail" in the name
+                    if 'thumbnail' in name.lower():
+                        return Path(entry.path)
+                    # If no explicit thumbnail file, fall back to the first image file
+                    if fallback is None:
+                        fallback = entry.path
+        
+        return Path(fallback) if fallback else None
     
     def _parse_upload_date(self, date_str: str) -> Optional[datetime]:
         """
@@ -384,7 +392,7 @@ class RecoveryManager:
             'description': channel_info.get('description'),
             'subscriber_count': channel_info.get('subscriber_count'),
             'thumbnail_url': channel_info.get('thumbnail_url'),
-            'updated_at': datetime.now()
+            'updated_at': utc_timestamp()
         }
         
         if existing:
@@ -399,7 +407,7 @@ class RecoveryManager:
             return existing['id']
         else:
             # Create new channel
-            channel_data['created_at'] = datetime.now()
+            channel_data['created_at'] = utc_timestamp()
             channel_id = await self.db.insert('channels', channel_data)
             channel_info['_created'] = True
             return channel_id
@@ -440,7 +448,7 @@ class RecoveryManager:
             'thumbnail_generated': video_info.get('thumbnail_generated', False),
             'thumbnail_timestamp': video_info.get('thumbnail_timestamp'),
             'download_status': 'completed' if video_info.get('file_path') else 'pending',
-            'updated_at': datetime.now()
+            'updated_at': utc_timestamp()
         }
         
         if existing:
@@ -455,7 +463,7 @@ class RecoveryManager:
             return existing['id']
         else:
             # Create new video
-            video_data['created_at'] = datetime.now()
+            video_data['created_at'] = utc_timestamp()
             video_id = await self.db.insert('videos', video_data)
             video_info['_created'] = True
             return video_id
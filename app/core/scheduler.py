@@ -3,12 +3,11 @@ Scheduler service for automatic subscription checking
 """
 import logging
 import time
-from datetime import datetime
 from typing import Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from app.core.database import Database
+from app.core.database import Database, utc_timestamp
 from app.core.downloader import Downloader
 from app.core.metadata import classify_video_type
 
@@ -102,7 +101,7 @@ class SubscriptionScheduler:
                 "subscription_id": subscription_id,
                 "event_type": "check_started",
                 "status": "success",
-                "started_at": datetime.utcnow().isoformat()
+                "started_at": utc_timestamp()
             })
             
             # Get subscription details
@@ -155,7 +154,7 @@ class SubscriptionScheduler:
             "videos_filtered": videos_filtered,
             "duration_ms": duration_ms,
             "error_count": error_count,
-            "completed_at": datetime.utcnow().isoformat()
+            "completed_at": utc_timestamp()
         }
         
         if error_message:
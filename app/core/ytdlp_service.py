@@ -11,13 +11,29 @@ import re
 import sys
 import io
 import contextlib
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 import yt_dlp
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# Download options that change per video; everything else is shared by a worker's cached YoutubeDL
+_PER_DOWNLOAD_PARAMS = frozenset({'outtmpl', 'format', 'progress_hooks', 'logger', 'user_agent'})
+
+
+class _ProgressRelay:
+    """Forward progress events from a cached YoutubeDL to the current download's hooks"""
+    def __init__(self):
+        self.hooks = ()
+
+    def __call__(self, d):
+        for hook in self.hooks:
+            hook(d)
+
+
 class YTDLPService:
     def __init__(self):
         self.failure_count = 0
@@ -31,6 +47,22 @@ class YTDLPService:
             settings.YTDLP_USER_AGENT  # Keep original as fallback
         ]
         self.cookies_setup = self._setup_cookies()
+        self._info_ydl: Dict[tuple, yt_dlp.YoutubeDL] = {}  # Reused extractors, keyed by extra config
+        # yt-dlp blocks, so it runs off the event loop. Downloads get their own pool so
+        # long transfers can't starve metadata probes; the single info worker also
+        # serializes use of the cached extractors, which aren't thread-safe.
+        self._download_executor = ThreadPoolExecutor(
+            max_workers=settings.MAX_CONCURRENT_DOWNLOADS, thread_name_prefix="ytdlp-dl"
+        )
+        self._info_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ytdlp-info")
+        self._download_local = threading.local()  # Per download worker: (static options, YoutubeDL, relay)
+        # Every live download YoutubeDL -> whether a download is using it, so all of
+        # them can be closed (saving cookies) once the service shuts down
+        self._download_ydls: Dict[yt_dlp.YoutubeDL, bool] = {}
+        self._ydl_lock = threading.Lock()
+        self._closed = False
+        self._redirect_lock = threading.Lock()
+        self._redirect_depth = 0
         logger.info("YTDLPService initialized with UA rotation and cookies")
 
     def _setup_cookies(self) -> Optional[tuple]:
@@ -65,30 +97,36 @@ class YTDLPService:
 
     @contextlib.contextmanager
     def _redirect_stdout_stderr(self):
-        """Redirect stdout/stderr during yt-dlp operations to prevent HTTP response corruption"""
-        old_stdout = sys.stdout
-        old_stderr = sys.stderr
-        
-        stdout_buffer = io.StringIO()
-        stderr_buffer = io.StringIO()
+        """Redirect stdout/stderr during yt-dlp operations to prevent HTTP response corruption
+
+        Operations run concurrently on worker threads, so the swap is shared: the first
+        one in redirects, the last one out restores.
+        """
+        with self._redirect_lock:
+            if self._redirect_depth == 0:
+                self._saved_streams = (sys.stdout, sys.stderr)
+                sys.stdout = io.StringIO()
+                sys.stderr = io.StringIO()
+            self._redirect_depth += 1
         
         try:
-            sys.stdout = stdout_buffer
-            sys.stderr = stderr_buffer
             yield
         finally:
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
-            
-            # Log any captured output if verbose is enabled
-            if settings.YTDLP_VERBOSE:
-                stdout_content = stdout_buffer.getvalue()
-                stderr_content = stderr_buffer.getvalue()
-                
-                if stdout_content.strip():
-                    logger.info(f"[yt-dlp stdout] {stdout_content.strip()}")
-                if stderr_content.strip():
-                    logger.warning(f"[yt-dlp stderr] {stderr_content.strip()}")
+            with self._redirect_lock:
+                self._redirect_depth -= 1
+                if self._redirect_depth == 0:
+                    stdout_buffer, stderr_buffer = sys.stdout, sys.stderr
+                    sys.stdout, sys.stderr = self._saved_streams
+                    
+                    # Log any captured output if verbose is enabled
+                    if settings.YTDLP_VERBOSE:
+                        stdout_content = stdout_buffer.getvalue()
+                        stderr_content = stderr_buffer.getvalue()
+                        
+                        if stdout_content.strip():
+                            logger.info(f"[yt-dlp stdout] {stdout_content.strip()}")
+                        if stderr_content.strip():
+                            logger.warning(f"[yt-dlp stderr] {stderr_content.strip()}")
 
     def _is_permanent_error(self, error: Exception) -> bool:
         """
@@ -157,6 +195,7 @@ class YTDLPService:
             'retries': settings.YTDLP_MAX_RETRIES,
             'sleep_interval': settings.YTDLP_SLEEP_INTERVAL,
             'geo_bypass': True,
+            'cachedir': str(settings.ytdlp_cache_dir),  # Keep deciphered player JS between runs
             'logger': self._get_ytdlp_logger(),  # Use custom logger instead of stdout
         }
         if hasattr(settings, 'YTDLP_PROXY_URL') and settings.YTDLP_PROXY_URL:
@@ -165,7 +204,7 @@ class YTDLPService:
         
         # Log config excluding non-serializable objects like logger
         debug_config = {k: v for k, v in config.items() if k != 'logger'}
-        logger.debug(f"Using config: {json.dumps(debug_config, indent=2)}")
+        logger.debug(f"Using config: {json.dumps(debug_config, indent=2, default=repr)}")
         return config
 
     async def _run_with_retries(self, func, op_name: str, url: str, max_retries: int = settings.YTDLP_MAX_RETRIES):
@@ -173,6 +212,8 @@ class YTDLPService:
             try:
                 await self._enforce_rate_limit()
                 return await func()
+            except yt_dlp.utils.DownloadCancelled:
+                raise  # Stopped on purpose; never retried
             except Exception as e:
                 self.failure_count += 1
                 error_type = type(e).__name__
@@ -226,25 +267,129 @@ class YTDLPService:
             'cookies_enabled': self.cookies_setup is not None
         }
 
+    def _get_info_ydl(self, extra_config: Dict) -> yt_dlp.YoutubeDL:
+        """Get a cached YoutubeDL for metadata extraction, building it on first use"""
+        key = tuple(sorted(extra_config.items()))
+        ydl = self._info_ydl.get(key)
+        if ydl is None:
+            ydl = self._info_ydl[key] = yt_dlp.YoutubeDL(self._get_config(extra_config))
+        # Rotate UA per request; the headers dict is read fresh for every request
+        ydl.params['http_headers']['User-Agent'] = random.choice(self.user_agents)
+        return ydl
+
     async def extract_info(self, url: str, extra_config: Optional[Dict] = None) -> Dict[str, Any]:
+        def _extract_sync():
+            with self._redirect_stdout_stderr():
+                ydl = self._get_info_ydl(extra_config or {})
+                return ydl.extract_info(url, download=False)
+        
         async def _extract():
-            config = self._get_config(extra_config or {})
-            try:
-                with self._redirect_stdout_stderr():
-                    with yt_dlp.YoutubeDL(config) as ydl:
-                        return ydl.extract_info(url, download=False)
-            except Exception as e:
-                raise
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._info_executor, _extract_sync)
         return await self._run_with_retries(_extract, 'INFO_EXTRACT', url)
 
+    @staticmethod
+    def _close_ydl(ydl: yt_dlp.YoutubeDL):
+        """Close a YoutubeDL (saves cookies, closes its connections)"""
+        try:
+            ydl.close()
+        except Exception as e:
+            logger.warning(f"Failed to close yt-dlp instance: {e}")
+
+    def _get_download_ydl(self, config: Dict) -> Tuple[yt_dlp.YoutubeDL, _ProgressRelay]:
+        """Get this worker thread's YoutubeDL with per-download options applied
+
+        The instance is rebuilt only when the shared options change (e.g. settings
+        were edited); output template, format and progress hooks are swapped per call.
+        """
+        static = {k: v for k, v in config.items() if k not in _PER_DOWNLOAD_PARAMS}
+        cached = getattr(self._download_local, 'ydl', None)
+        if cached is None or cached[0] != static:
+            self._discard_download_ydl()
+            relay = _ProgressRelay()
+            ydl = yt_dlp.YoutubeDL({**static, 'logger': config.get('logger'), 'progress_hooks': [relay]})
+            cached = self._download_local.ydl = (static, ydl, relay)
+        _, ydl, relay = cached
+        with self._ydl_lock:
+            self._download_ydls[ydl] = True
+        
+        # Re-run YoutubeDL.__init__'s own setup for the per-download options
+        outtmpl = config['outtmpl']
+        ydl.params['outtmpl'] = dict(outtmpl) if isinstance(outtmpl, dict) else outtmpl
+        ydl._parse_outtmpl()  # Fills in default templates, honouring restrictfilenames
+        
+        format_spec = config.get('format')
+        ydl.params['format'] = format_spec
+        ydl.format_selector = (
+            format_spec if format_spec in (None, '-') or callable(format_spec)
+            else ydl.build_format_selector(format_spec)
+        )
+        
+        relay.hooks = tuple(config.get('progress_hooks', ()))
+        ydl.params['http_headers']['User-Agent'] = random.choice(self.user_agents)
+        return ydl, relay
+
+    def _release_download_ydl(self, ydl: yt_dlp.YoutubeDL):
+        """Mark this worker thread's YoutubeDL idle, closing it if the service has shut down"""
+        with self._ydl_lock:
+            if not self._closed:
+                self._download_ydls[ydl] = False
+                return
+        self._discard_download_ydl()
+
+    def _discard_download_ydl(self):
+        """Close and forget this worker thread's YoutubeDL"""
+        cached = getattr(self._download_local, 'ydl', None)
+        self._download_local.ydl = None
+        if cached is None:
+            return
+        ydl = cached[1]
+        with self._ydl_lock:
+            self._download_ydls.pop(ydl, None)
+        self._close_ydl(ydl)
+
+    def shutdown(self):
+        """Stop the yt-dlp workers and close every cached YoutubeDL
+
+        Queued work is dropped. A download still running closes its own instance
+        when it returns.
+        """
+        self._download_executor.shutdown(wait=False, cancel_futures=True)
+        # Info extraction is short and bounded by timeouts; wait so its extractors are idle
+        self._info_executor.shutdown(wait=True, cancel_futures=True)
+        for ydl in self._info_ydl.values():
+            self._close_ydl(ydl)
+        self._info_ydl.clear()
+        
+        with self._ydl_lock:
+            self._closed = True
+            idle = [ydl for ydl, busy in self._download_ydls.items() if not busy]
+            for ydl in idle:
+                del self._download_ydls[ydl]
+        for ydl in idle:
+            self._close_ydl(ydl)
+
     async def download_with_progress(self, url: str, output_path: Path, progress_callback=None, extra_config: Optional[Dict] = None) -> bool:
-        async def _download():
+        def _download_sync():
             config = self._get_config(extra_config or {})
-            config['outtmpl'] = str(output_path / '%(title)s.%(ext)s')
+            # Keep the caller's naming (Downloader writes video.* / thumbnail.*)
+            config.setdefault('outtmpl', str(output_path / '%(title)s.%(ext)s'))
             with self._redirect_stdout_stderr():
-                with yt_dlp.YoutubeDL(config) as ydl:
+                ydl, relay = self._get_download_ydl(config)
+                try:
                     ydl.download([url])
-                    return True
+                except Exception:
+                    # Don't carry a failed instance's state into the next download
+                    relay.hooks = ()
+                    self._discard_download_ydl()
+                    raise
+                relay.hooks = ()  # Release this download's progress tracker
+                self._release_download_ydl(ydl)
+                return True
+        
+        async def _download():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._download_executor, _download_sync)
         return await self._run_with_retries(_download, 'DOWNLOAD', url)
 
 # Global instance (unchanged)
@@ -253,4 +398,10 @@ def get_ytdlp_service() -> YTDLPService:
     global _ytdlp_service
     if _ytdlp_service is None:
         _ytdlp_service = YTDLPService()
-    return _ytdlp_service 
\ No newline at end of file
+    return _ytdlp_service
+
+
+def shutdown_ytdlp_service():
+    """Shut down the global service, if it was ever started (blocks; run off the event loop)"""
+    if _ytdlp_service is not None:
+        _ytdlp_service.shutdown() 
\ No newline at end of file
@@ -7,6 +7,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import os
 import logging
 
@@ -14,6 +15,7 @@ from app.core.config import settings
 from app.core.logging_setup import setup_logging
 from app.core.database import Database
 from app.core.recovery import RecoveryManager
+from app.core.ytdlp_service import shutdown_ytdlp_service
 from app.api.endpoints import auth, videos, channels, subscriptions, downloads
 
 # Initialize logging first
@@ -33,6 +35,8 @@ async def lifespan(app: FastAPI):
     scheduler = SubscriptionScheduler(db)
     await scheduler.start()
     app.state.scheduler = scheduler
+    # Share one downloader so the API sees live progress of scheduled downloads too
+    app.state.downloader = scheduler.downloader
     
     # Auto-recovery on startup if database is empty
     try:
@@ -53,6 +57,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     await app.state.scheduler.stop()
+    await asyncio.to_thread(shutdown_ytdlp_service)
     logger.info("YouHoard application shutting down...")
 
 app = FastAPI(
@@ -9,8 +9,8 @@ CREATE TABLE IF NOT EXISTS channels (
     subscriber_count INTEGER,
     thumbnail_url TEXT,
     extra_metadata TEXT, -- JSON object for arbitrary future metadata
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    updated_at TIMESTAMP DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
 );
 
 -- Videos table
@@ -33,8 +33,8 @@ CREATE TABLE IF NOT EXISTS videos (
     thumbnail_generated BOOLEAN DEFAULT FALSE, -- whether thumbnail was generated from video
     thumbnail_timestamp REAL, -- timestamp in seconds for generated thumbnails
     extra_metadata TEXT, -- JSON object for arbitrary future metadata
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    updated_at TIMESTAMP DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
     FOREIGN KEY (channel_id) REFERENCES channels (id)
 );
 
@@ -56,7 +56,7 @@ CREATE TABLE IF NOT EXISTS subscriptions (
     last_check TIMESTAMP,
     new_videos_count INTEGER DEFAULT 0, -- count of new videos found in last check
     extra_metadata TEXT, -- JSON object for arbitrary future metadata
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
     FOREIGN KEY (channel_id) REFERENCES channels (id)
 );
 
@@ -75,7 +75,7 @@ CREATE TABLE IF NOT EXISTS scheduler_events (
     error_count INTEGER DEFAULT 0, -- count of individual video processing errors
     content_types_processed TEXT, -- JSON array of content types found
     metadata TEXT, -- JSON object for additional event details
-    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
     completed_at TIMESTAMP,
     FOREIGN KEY (subscription_id) REFERENCES subscriptions (id) ON DELETE CASCADE
 );
@@ -85,7 +85,7 @@ CREATE TABLE IF NOT EXISTS tags (
     id INTEGER PRIMARY KEY,
     name TEXT UNIQUE NOT NULL,
     color TEXT, -- hex color for UI
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
 );
 
 -- Video Tags (many-to-many)
@@ -123,7 +123,7 @@ CREATE TABLE IF NOT EXISTS job_queue (
     result_data TEXT, -- JSON object with job results
     started_at TIMESTAMP,
     completed_at TIMESTAMP,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
     FOREIGN KEY (video_id) REFERENCES videos (id) ON DELETE CASCADE,
     FOREIGN KEY (subscription_id) REFERENCES subscriptions (id) ON DELETE CASCADE
 );
@@ -133,7 +133,7 @@ CREATE TABLE IF NOT EXISTS settings (
     key TEXT PRIMARY KEY,
     value TEXT NOT NULL,
     description TEXT,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
 );
 
 -- Users (simple auth)
@@ -141,7 +141,7 @@ CREATE TABLE IF NOT EXISTS users (
     id INTEGER PRIMARY KEY,
     username TEXT UNIQUE NOT NULL,
     password_hash TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
 );
 
 -- Sessions table
@@ -175,21 +175,50 @@ CREATE INDEX IF NOT EXISTS idx_channel_tags_tag_id ON channel_tags(tag_id);
 CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id);
 CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at);
 
+-- Full-text index over video titles and descriptions (external content: rows live in videos)
+CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
+    title,
+    description,
+    content='videos',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+-- Triggers to keep the full-text index in sync with videos
+CREATE TRIGGER IF NOT EXISTS videos_fts_ai
+AFTER INSERT ON videos
+BEGIN
+    INSERT INTO videos_fts(rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS videos_fts_ad
+AFTER DELETE ON videos
+BEGIN
+    INSERT INTO videos_fts(videos_fts, rowid, title, description) VALUES ('delete', OLD.id, OLD.title, OLD.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS videos_fts_au
+AFTER UPDATE OF title, description ON videos
+BEGIN
+    INSERT INTO videos_fts(videos_fts, rowid, title, description) VALUES ('delete', OLD.id, OLD.title, OLD.description);
+    INSERT INTO videos_fts(rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+END;
+
 -- Triggers to update timestamps
 CREATE TRIGGER IF NOT EXISTS update_channels_timestamp 
 AFTER UPDATE ON channels
 BEGIN
-    UPDATE channels SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+    UPDATE channels SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE id = NEW.id;
 END;
 
 CREATE TRIGGER IF NOT EXISTS update_videos_timestamp 
 AFTER UPDATE ON videos
 BEGIN
-    UPDATE videos SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+    UPDATE videos SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE id = NEW.id;
 END;
 
 CREATE TRIGGER IF NOT EXISTS update_settings_timestamp 
 AFTER UPDATE ON settings
 BEGIN
-    UPDATE settings SET updated_at = CURRENT_TIMESTAMP WHERE key = NEW.key;
+    UPDATE settings SET updated_at = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE key = NEW.key;
 END; 
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Shared fixtures for the YouHoard test suite
+"""
+import pytest
+
+from app.core.database import Database
+
+
+@pytest.fixture
+async def db(tmp_path):
+    """A fresh database initialized from schema.sql"""
+    database = Database(str(tmp_path / "test.db"))
+    await database.init_db()
+    return database
+
+
+@pytest.fixture
+async def channel_id(db):
+    """Id of a channel to attach test videos to"""
+    return await db.insert("channels", {"youtube_id": "UC_test", "name": "Test Channel"})
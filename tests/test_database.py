@@ -0,0 +1,161 @@
+"""
+Tests for the Database write helpers
+"""
+import sqlite3
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.database import Database
+
+
+class VideoRow(BaseModel):
+    id: int
+    youtube_id: str
+    title: str
+
+
+def _video(youtube_id: str, channel_id: int, title: str = "A video") -> dict:
+    return {"youtube_id": youtube_id, "channel_id": channel_id, "title": title}
+
+
+async def test_insert_many_returns_inserted_rows(db, channel_id):
+    ids = await db.insert_many(
+        "videos", [_video("a", channel_id), _video("b", channel_id)], "youtube_id"
+    )
+    
+    assert set(ids) == {"a", "b"}
+    rows = await db.execute("SELECT id, youtube_id FROM videos")
+    assert {row["youtube_id"]: row["id"] for row in rows} == ids
+
+
+async def test_insert_many_skips_conflicts(db, channel_id):
+    existing = await db.insert("videos", _video("a", channel_id, "Original"))
+    
+    ids = await db.insert_many(
+        "videos",
+        [_video("a", channel_id, "Duplicate"), _video("b", channel_id), _video("b", channel_id)],
+        "youtube_id"
+    )
+    
+    # Only the row inserted by this batch is reported, once
+    assert list(ids) == ["b"]
+    assert ids["b"] != existing
+    original = await db.execute_one("SELECT title FROM videos WHERE id = ?", (existing,))
+    assert original["title"] == "Original"
+    assert (await db.execute_one("SELECT COUNT(*) AS n FROM videos"))["n"] == 2
+
+
+async def test_insert_many_empty(db):
+    generation = db.videos_generation
+    
+    assert await db.insert_many("videos", [], "youtube_id") == {}
+    assert db.videos_generation == generation
+
+
+async def test_insert_many_bumps_generation(db, channel_id):
+    generation = db.videos_generation
+    
+    await db.insert_many("videos", [_video("a", channel_id)], "youtube_id")
+    
+    assert db.videos_generation > generation
+
+
+async def test_insert_or_ignore(db):
+    data = {"youtube_id": "UC_other", "name": "Other"}
+    
+    first = await db.insert_or_ignore("channels", data, "youtube_id")
+    second = await db.insert_or_ignore("channels", data, "youtube_id")
+    
+    assert first is not None
+    assert second is None
+    rows = await db.execute("SELECT id FROM channels WHERE youtube_id = ?", ("UC_other",))
+    assert [row["id"] for row in rows] == [first]
+
+
+async def test_execute_returning(db, channel_id):
+    video_id = await db.insert("videos", _video("a", channel_id))
+    
+    row = await db.execute_returning(
+        "UPDATE videos SET download_status = ? WHERE id = ? RETURNING id, download_status",
+        ("completed", video_id)
+    )
+    missing = await db.execute_returning(
+        "UPDATE videos SET download_status = ? WHERE id = ? RETURNING id",
+        ("completed", video_id + 1)
+    )
+    
+    assert row == {"id": video_id, "download_status": "completed"}
+    assert missing is None
+    stored = await db.execute_one("SELECT download_status FROM videos WHERE id = ?", (video_id,))
+    assert stored["download_status"] == "completed"
+
+
+async def test_execute_returning_bumps_generation_for_list_tables(db, channel_id):
+    generation = db.videos_generation
+    
+    await db.execute_returning(
+        "INSERT INTO tags (name) VALUES (?) RETURNING id", ("music",)
+    )
+    assert db.videos_generation > generation
+    
+    generation = db.videos_generation
+    await db.execute_returning(
+        "INSERT INTO settings (key, value) VALUES (?, ?) RETURNING key", ("theme", "dark")
+    )
+    assert db.videos_generation == generation
+
+
+async def test_update_many(db, channel_id):
+    video_id = await db.insert("videos", _video("a", channel_id))
+    job_id = await db.insert("job_queue", {"job_type": "download", "video_id": video_id, "status": "downloading"})
+    
+    await db.update_many([
+        ("job_queue", {"status": "completed"}, "id = ?", (job_id,)),
+        ("videos", {"download_status": "completed", "file_size": 123}, "id = ?", (video_id,)),
+    ])
+    
+    job = await db.execute_one("SELECT status FROM job_queue WHERE id = ?", (job_id,))
+    video = await db.execute_one("SELECT download_status, file_size FROM videos WHERE id = ?", (video_id,))
+    assert job["status"] == "completed"
+    assert video == {"download_status": "completed", "file_size": 123}
+
+
+async def test_update_many_is_atomic(db, channel_id):
+    video_id = await db.insert("videos", _video("a", channel_id))
+    job_id = await db.insert("job_queue", {"job_type": "download", "video_id": video_id, "status": "downloading"})
+    
+    with pytest.raises(sqlite3.OperationalError):
+        await db.update_many([
+            ("job_queue", {"status": "completed"}, "id = ?", (job_id,)),
+            ("videos", {"no_such_column": 1}, "id = ?", (video_id,)),
+        ])
+    
+    # The first update was rolled back with the failing one
+    job = await db.execute_one("SELECT status FROM job_queue WHERE id = ?", (job_id,))
+    assert job["status"] == "downloading"
+
+
+async def test_execute_model(db, channel_id):
+    await db.insert_many(
+        "videos", [_video("a", channel_id, "First"), _video("b", channel_id, "Second")], "youtube_id"
+    )
+    
+    videos = await db.execute_model(
+        "SELECT id, youtube_id, title FROM videos ORDER BY youtube_id", None, VideoRow
+    )
+    
+    assert all(isinstance(video, VideoRow) for video in videos)
+    assert [(video.youtube_id, video.title) for video in videos] == [("a", "First"), ("b", "Second")]
+
+
+async def test_execute_model_empty(db):
+    assert await db.execute_model("SELECT id, youtube_id, title FROM videos", None, VideoRow) == []
+
+
+def test_json_roundtrip():
+    data = {"languages": ["en", "de"], 1: True}
+    
+    assert Database.json_decode(Database.json_encode(data)) == {"languages": ["en", "de"], "1": True}
+    assert Database.json_encode(None) is None
+    assert Database.json_decode(None) is None
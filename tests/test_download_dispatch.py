@@ -0,0 +1,128 @@
+"""
+Tests for priority dispatch of download jobs to the worker pool
+"""
+import asyncio
+import dataclasses
+
+import pytest
+
+import app.core.downloader as downloader_module
+from app.core.config import settings
+from app.core.downloader import Downloader
+
+
+@pytest.fixture
+async def downloader(db, channel_id, monkeypatch):
+    """A Downloader with one download worker whose jobs are recorded instead of downloaded"""
+    monkeypatch.setattr(downloader_module, "settings", dataclasses.replace(settings, MAX_CONCURRENT_DOWNLOADS=1))
+    instance = Downloader(db)
+    instance.started = []  # video ids in the order their jobs ran
+    instance.release = asyncio.Event()
+    
+    async def fake_download_job(job):
+        instance.started.append(job["video_id"])
+        await instance.release.wait()
+        if job["quality"] == "broken":
+            raise RuntimeError("download failed")
+    
+    instance._process_download_job = fake_download_job
+    yield instance
+    for worker in instance._download_workers:
+        worker.cancel()
+    await asyncio.gather(*instance._download_workers, return_exceptions=True)
+
+
+async def _add_videos(db, channel_id: int, count: int) -> list:
+    return [
+        await db.insert("videos", {
+            "youtube_id": f"video{n:06d}",
+            "channel_id": channel_id,
+            "title": f"Video {n}",
+        })
+        for n in range(count)
+    ]
+
+
+async def _drain(downloader: Downloader):
+    downloader.release.set()
+    await asyncio.wait_for(downloader._download_queue.join(), timeout=5)
+
+
+async def _job_status(db, queue_id: int) -> str:
+    return (await db.execute_one("SELECT status FROM job_queue WHERE id = ?", (queue_id,)))["status"]
+
+
+async def test_higher_priority_runs_first(db, channel_id, downloader):
+    first, low, high, mid, high_later = await _add_videos(db, channel_id, 5)
+    # Occupy the only worker so the rest wait in the queue together
+    await downloader.queue_download(first)
+    await asyncio.sleep(0.05)
+    for video_id, priority in ((low, 0), (high, 5), (mid, 1), (high_later, 5)):
+        await downloader.queue_download(video_id, priority=priority)
+    
+    await _drain(downloader)
+    
+    # Ties keep their queueing order
+    assert downloader.started == [first, high, high_later, mid, low]
+
+
+async def test_completed_job_leaves_active_tasks(db, channel_id, downloader):
+    video_id, = await _add_videos(db, channel_id, 1)
+    
+    queue_id = await downloader.queue_download(video_id)
+    await asyncio.sleep(0.05)
+    assert queue_id in downloader.active_tasks
+    await _drain(downloader)
+    
+    assert downloader.active_tasks == {}
+
+
+async def test_repeat_dispatch_of_running_job_is_skipped(db, channel_id, downloader):
+    video_id, = await _add_videos(db, channel_id, 1)
+    
+    queue_id = await downloader.queue_download(video_id)
+    await asyncio.sleep(0.05)
+    downloader.dispatch_download(queue_id, priority=10)
+    await asyncio.sleep(0.05)
+    
+    # The worker is busy with the job, so the repeat waits; it must not run it twice
+    assert downloader._download_queue.qsize() == 1
+    await _drain(downloader)
+    
+    assert downloader.started == [video_id]
+
+
+async def test_repeat_dispatch_of_finished_job_is_skipped(db, channel_id, downloader):
+    video_id, = await _add_videos(db, channel_id, 1)
+    queue_id = await downloader.queue_download(video_id)
+    await _drain(downloader)
+    
+    # The job is no longer queued, so the claim in _process_job fails
+    downloader.dispatch_download(queue_id)
+    await _drain(downloader)
+    
+    assert downloader.started == [video_id]
+
+
+async def test_failed_job_is_marked_failed(db, channel_id, downloader):
+    video_id, = await _add_videos(db, channel_id, 1)
+    
+    queue_id = await downloader.queue_download(video_id, quality="broken")
+    await _drain(downloader)
+    
+    job = await db.execute_one("SELECT status, error_message FROM job_queue WHERE id = ?", (queue_id,))
+    assert job == {"status": "failed", "error_message": "download failed"}
+    assert downloader.active_tasks == {}
+
+
+async def test_worker_pool_is_bounded(db, channel_id, downloader):
+    video_ids = await _add_videos(db, channel_id, 3)
+    
+    for video_id in video_ids:
+        await downloader.queue_download(video_id)
+    await asyncio.sleep(0.05)
+    
+    assert len(downloader._download_workers) == 1
+    assert downloader.started == video_ids[:1]
+    await _drain(downloader)
+    assert downloader.started == video_ids
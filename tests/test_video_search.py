@@ -0,0 +1,117 @@
+"""
+Tests for full-text video search and the triggers that keep its index in sync
+"""
+from app.api.endpoints.videos import _fetch_video_page, _fts_match_expression
+
+
+def _youtube_id(key: str) -> str:
+    """An 11-character YouTube id derived from a short test key"""
+    return key.ljust(11, "0")
+
+
+async def _search(db, search: str, channel_id=None, status=None):
+    """(keys of the matching videos, total) for a search"""
+    page = await _fetch_video_page(db, 1, 50, channel_id, status, search)
+    return [video.youtube_id.rstrip("0") for video in page.videos], page.total
+
+
+async def _add_video(db, channel_id: int, key: str, title: str, description=None) -> int:
+    return await db.insert("videos", {
+        "youtube_id": _youtube_id(key),
+        "channel_id": channel_id,
+        "title": title,
+        "description": description,
+    })
+
+
+def test_match_expression_quotes_prefix_terms():
+    assert _fts_match_expression("cat videos") == '"cat"* "videos"*'
+    assert _fts_match_expression('say "hi"') == '"say"* """hi"""*'
+    assert _fts_match_expression("  ") == ""
+
+
+async def test_search_title_and_description(db, channel_id):
+    await _add_video(db, channel_id, "a", "Cats being cats")
+    await _add_video(db, channel_id, "b", "Dogs", "A dog meets a cat")
+    await _add_video(db, channel_id, "c", "Birds")
+    
+    ids, total = await _search(db, "cat")
+    
+    assert sorted(ids) == ["a", "b"]
+    assert total == 2
+
+
+async def test_search_matches_all_terms_as_prefixes(db, channel_id):
+    await _add_video(db, channel_id, "a", "Mountain biking highlights")
+    await _add_video(db, channel_id, "b", "Mountain hiking")
+    
+    assert (await _search(db, "moun bik"))[0] == ["a"]
+
+
+async def test_search_ignores_diacritics(db, channel_id):
+    await _add_video(db, channel_id, "a", "Café tour")
+    
+    assert (await _search(db, "cafe"))[0] == ["a"]
+
+
+async def test_search_combines_with_filters(db, channel_id):
+    await _add_video(db, channel_id, "a", "Cooking pasta")
+    done = await _add_video(db, channel_id, "b", "Cooking rice")
+    await db.update("videos", {"download_status": "completed"}, "id = ?", (done,))
+    
+    ids, total = await _search(db, "cooking", channel_id=channel_id, status="completed")
+    
+    assert ids == ["b"]
+    assert total == 1
+
+
+async def test_search_input_is_not_fts_syntax(db, channel_id):
+    await _add_video(db, channel_id, "a", "Title")
+    
+    # Operators and stray quotes are searched as text rather than raising syntax errors
+    assert (await _search(db, 'x" OR "y'))[0] == []
+    assert (await _search(db, "NOT title"))[0] == []
+
+
+async def test_index_follows_updates(db, channel_id):
+    video_id = await _add_video(db, channel_id, "a", "Old name", "First description")
+    
+    await db.update("videos", {"title": "New name", "description": "Second"}, "id = ?", (video_id,))
+    
+    assert (await _search(db, "old"))[0] == []
+    assert (await _search(db, "first"))[0] == []
+    assert (await _search(db, "new second"))[0] == ["a"]
+
+
+async def test_index_follows_deletes(db, channel_id):
+    video_id = await _add_video(db, channel_id, "a", "Short lived")
+    
+    await db.delete("videos", "id = ?", (video_id,))
+    
+    assert await _search(db, "short") == ([], 0)
+
+
+async def test_ignored_upsert_leaves_index_alone(db, channel_id):
+    await _add_video(db, channel_id, "a", "Original title")
+    
+    ignored = await db.insert_or_ignore(
+        "videos", {"youtube_id": _youtube_id("a"), "channel_id": channel_id, "title": "Replacement title"}, "youtube_id"
+    )
+    
+    assert ignored is None
+    assert (await _search(db, "title"))[0] == ["a"]
+    assert (await _search(db, "replacement"))[0] == []
+
+
+async def test_init_db_indexes_existing_videos(db, channel_id):
+    await _add_video(db, channel_id, "a", "Archived upload")
+    # Simulate a database from before the search index existed
+    async with db.get_db() as conn:
+        for trigger in ("videos_fts_ai", "videos_fts_ad", "videos_fts_au"):
+            await conn.execute(f"DROP TRIGGER {trigger}")
+        await conn.execute("DROP TABLE videos_fts")
+        await conn.commit()
+    
+    await db.init_db()
+    
+    assert (await _search(db, "archived"))[0] == ["a"]